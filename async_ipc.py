@@ -0,0 +1,171 @@
+"""asyncio 生产者/消费者
+
+事件循环运行在一个后台线程中，生产者和消费者都是该循环上的协程，共享一个
+有界的 asyncio.Queue，因此几千个生产者/消费者也只占用一个 OS 线程。
+
+界面不接收逐条消息的回调：循环上的监视协程每 PROBE_INTERVAL 秒醒来一次，
+用实际醒来时刻与预定时刻之差估计循环延迟，并记录当时的队列深度；每秒 rate 次
+把计数、队列内容和统计汇总成快照，再调用 on_sample 通知界面重绘。
+"""
+import asyncio
+import itertools
+import threading
+from collections import deque
+
+PROBE_INTERVAL = 0.01
+SAMPLE_RATE = 10
+LAG_WINDOW = 500           # 统计循环延迟的最近探测次数
+SNAPSHOT_LIMIT = 64
+
+
+def percentile_from_counts(counts, q):
+    """按计数表（下标为取值）求第 q 百分位数"""
+    total = sum(counts)
+    if not total:
+        return 0
+    rank = max(1, int(q / 100 * total + 0.5))
+    seen = 0
+    for value, count in enumerate(counts):
+        seen += count
+        if seen >= rank:
+            return value
+    return len(counts) - 1
+
+
+class AsyncIPC:
+    def __init__(self, capacity, on_sample=None, rate=SAMPLE_RATE):
+        self.capacity = capacity
+        self.on_sample = on_sample
+        self.rate = rate
+        self.put_count = 0
+        self.get_count = 0
+        self.producers = []
+        self.consumers = []
+        self.next_producer = 1
+        self.sequence = itertools.count()
+        self.lags = deque(maxlen=LAG_WINDOW)     # 最近的循环延迟（秒）
+        self.depths = [0] * (capacity + 1)       # 队列深度 -> 探测次数
+        self.queue = None
+        self.sample = self._summary([])
+
+        # 队列必须在事件循环所在的线程里创建
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        self.ready.wait()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.queue = asyncio.Queue(self.capacity)
+        self.monitor_task = self.loop.create_task(self.monitor())
+        self.loop.call_soon(self.ready.set)
+        self.loop.run_forever()
+        self.loop.close()
+
+    def _call(self, func, *args):
+        """在事件循环线程中执行 func 并等待结果"""
+        async def call():
+            return func(*args)
+        return asyncio.run_coroutine_threadsafe(call(), self.loop).result()
+
+    @property
+    def workers(self):
+        return len(self.producers) + len(self.consumers)
+
+    def start_producers(self, count, interval):
+        self._call(self._spawn, self.producers, self.produce, count, interval)
+
+    def start_consumers(self, count, interval):
+        self._call(self._spawn, self.consumers, self.consume, count, interval)
+
+    def _spawn(self, tasks, coroutine, count, interval):
+        if not self.workers:
+            self.depths = [0] * (self.capacity + 1)
+            self.lags.clear()
+        for _ in range(count):
+            tasks.append(self.loop.create_task(coroutine(interval)))
+
+    async def produce(self, interval):
+        """生产者协程：队列满时挂起在 put 上；间隔为 0 时每条消息后让出一次"""
+        producer = self.next_producer
+        self.next_producer += 1
+        while True:
+            await self.queue.put(f"A{producer}#{next(self.sequence)}")
+            self.put_count += 1
+            await asyncio.sleep(interval)
+
+    async def consume(self, interval):
+        """消费者协程：队列空时挂起在 get 上"""
+        while True:
+            await self.queue.get()
+            self.get_count += 1
+            await asyncio.sleep(interval)
+
+    def send(self, message):
+        """手动写入一条消息（队列满时不等待）"""
+        def put():
+            try:
+                self.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                return False
+            self.put_count += 1
+            return True
+        return self._call(put)
+
+    async def monitor(self):
+        """探测循环延迟和队列深度，按 rate 汇总快照并通知界面"""
+        loop = self.loop
+        probes_per_sample = max(1, round(1 / (self.rate * PROBE_INTERVAL)))
+        for probe in itertools.count(1):
+            expected = loop.time() + PROBE_INTERVAL
+            await asyncio.sleep(PROBE_INTERVAL)
+            self.lags.append(max(0.0, loop.time() - expected))
+            self.depths[self.queue.qsize()] += 1
+            if probe % probes_per_sample == 0:
+                # asyncio.Queue 没有公开的遍历接口，这里在循环线程中读取其内部 deque
+                self.sample = self._summary(list(itertools.islice(self.queue._queue, SNAPSHOT_LIMIT)))
+                if self.on_sample is not None:
+                    self.on_sample()
+
+    def _summary(self, items):
+        lags = sorted(self.lags)
+        return {
+            'items': items,
+            'count': self.queue.qsize() if self.queue is not None else 0,
+            'capacity': self.capacity,
+            'put_count': self.put_count,
+            'get_count': self.get_count,
+            'producers': len(self.producers),
+            'consumers': len(self.consumers),
+            'lag_last': self.lags[-1] if self.lags else 0.0,
+            'lag_p99': lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0,
+            'lag_max': lags[-1] if lags else 0.0,
+            'depths': list(self.depths),
+        }
+
+    def stop(self):
+        """取消所有生产者和消费者协程，保留队列内容"""
+        def cancel():
+            for task in self.producers + self.consumers:
+                task.cancel()
+            self.producers = []
+            self.consumers = []
+        self._call(cancel)
+
+    def release(self):
+        """停止事件循环线程"""
+        if not self.thread.is_alive():
+            return
+        asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    async def shutdown(self):
+        """取消全部协程并等待它们结束，避免关闭循环时留下挂起的任务"""
+        tasks = self.producers + self.consumers + [self.monitor_task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.producers = []
+        self.consumers = []
@@ -0,0 +1,191 @@
+"""甘特图布局（与绘图工具无关，Tk 画布和 SVG 导出共用）
+
+GanttIndex 把执行片段按泳道组织成区间索引：每条泳道内片段按开始时间排序、
+互不重叠，查询时间窗口 [t0, t1) 只需 bisect。不足一个像素的片段会按像素
+合并成一条聚合条，因此无论调度有多少片段，一次绘制的图元数量只与画布宽度
+和泳道数有关。
+
+GanttLayout 把可见部分转换成图元元组：
+    ('rect', x1, y1, x2, y2, fill, outline)
+    ('line', x1, y1, x2, y2)
+    ('text', x, y, text, anchor, size)
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from math import ceil, floor, log10
+
+COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8', '#F7DC6F']
+AGGREGATE_COLOR = '#A0A0A0'
+# 进程数不超过此值时每个进程一条泳道（与原来的甘特图一致），否则单核合为一条
+MAX_PID_LANES = 16
+
+MARGIN_X = 50
+MARGIN_Y = 50
+LANE_HEIGHT = 25
+BAR_HEIGHT = 20
+MIN_CHART_HEIGHT = 100
+CHAR_WIDTH = 6
+
+
+def pid_color(pid):
+    """进程对应的颜色"""
+    return COLORS[pid % len(COLORS)]
+
+
+def nice_step(raw):
+    """不小于 raw 的 1/2/5 × 10^k 刻度间隔"""
+    if raw <= 1:
+        return 1
+    base = 10 ** floor(log10(raw))
+    for m in (1, 2, 5, 10):
+        if m * base >= raw:
+            return m * base
+    return 10 * base
+
+
+class GanttIndex:
+    """按泳道组织的执行片段区间索引"""
+
+    def __init__(self, seg_pid, seg_start, seg_end, seg_lane=None, lane_labels=None):
+        self.max_time = max(seg_end) if len(seg_end) else 0
+        self.legend_pids = []
+
+        if seg_lane is not None:
+            lanes = max(seg_lane) + 1 if len(seg_lane) else 0
+            self.labels = list(lane_labels or [f"CPU{lane}" for lane in range(lanes)])
+        else:
+            pids = {}
+            for pid in seg_pid:
+                if pid not in pids:
+                    if len(pids) == MAX_PID_LANES:
+                        pids = None
+                        break
+                    pids[pid] = len(pids)
+            if pids is not None:
+                # 每个进程一条泳道，并显示图例
+                seg_lane = [pids[pid] for pid in seg_pid]
+                self.labels = [''] * len(pids)
+                self.legend_pids = list(pids)
+            else:
+                self.labels = ['CPU']
+
+        if seg_lane is None:
+            self.lanes = [self._sorted_lane(seg_pid, seg_start, seg_end)]
+        else:
+            columns = [(array('i'), array('q'), array('q')) for _ in self.labels]
+            for pid, start, end, lane in zip(seg_pid, seg_start, seg_end, seg_lane):
+                pids, starts, ends = columns[lane]
+                pids.append(pid)
+                starts.append(start)
+                ends.append(end)
+            self.lanes = [self._sorted_lane(*column) for column in columns]
+
+    @staticmethod
+    def _sorted_lane(pids, starts, ends):
+        """保证泳道内按开始时间排序"""
+        if all(map(int.__le__, starts, starts[1:])):
+            return pids, starts, ends
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+        return (array('i', (pids[i] for i in order)),
+                array('q', (starts[i] for i in order)),
+                array('q', (ends[i] for i in order)))
+
+    @classmethod
+    def from_schedule(cls, schedule):
+        """直接使用 Schedule 的列，不构造片段字典"""
+        return cls(schedule.seg_pid, schedule.seg_start, schedule.seg_end,
+                   getattr(schedule, 'seg_cpu', None))
+
+    @classmethod
+    def from_segments(cls, segments):
+        """由 [{'pid', 'start', 'end'[, 'cpu']}, ...] 构建"""
+        lanes = array('i', (s['cpu'] for s in segments)) if segments and 'cpu' in segments[0] else None
+        return cls(array('i', (s['pid'] for s in segments)),
+                   array('q', (s['start'] for s in segments)),
+                   array('q', (s['end'] for s in segments)), lanes)
+
+    def bars(self, lane, t0, t1, width):
+        """泳道在 [t0, t1) 内的条形，x 为相对绘图区左边的像素
+
+        返回 (x1, x2, pid, count)；count > 1 表示若干亚像素片段合并后的
+        聚合条，此时 pid 为 None。
+        """
+        pids, starts, ends = self.lanes[lane]
+        scale = width / (t1 - t0)
+        i = bisect_right(ends, t0)
+        hi = bisect_left(starts, t1)
+        bars = []
+        while i < hi:
+            x1 = (max(starts[i], t0) - t0) * scale
+            x2 = (min(ends[i], t1) - t0) * scale
+            if x2 - x1 >= 1:
+                bars.append((x1, x2, pids[i], 1))
+                i += 1
+                continue
+            # 亚像素片段：把结束于当前像素列内的片段合并成一条
+            bucket_end = t0 + (floor(x1) + 1) / scale
+            j = max(i + 1, bisect_right(ends, bucket_end, i, hi))
+            x2 = (min(ends[j - 1], t1) - t0) * scale
+            count = j - i
+            pid = pids[i] if count == 1 else None
+            last = bars[-1] if bars else None
+            if last is not None and last[3] > 1 and x1 - last[1] < 1:
+                # 与前一条聚合条相接则继续合并
+                bars[-1] = (last[0], x2, None, last[3] + count)
+            else:
+                bars.append((x1, max(x2, x1 + 1), pid, count))
+            i = j
+        return bars
+
+
+class GanttLayout:
+    """把时间窗口 [t0, t1) 内的甘特图转换为图元"""
+
+    def __init__(self, index, width=700):
+        self.index = index
+        self.width = width
+        self.chart_height = max(MIN_CHART_HEIGHT, len(index.labels) * LANE_HEIGHT)
+
+    def height(self):
+        """图的总高度（含时间轴和图例）"""
+        return MARGIN_Y + self.chart_height + (70 if self.index.legend_pids else 40)
+
+    def primitives(self, t0, t1):
+        """生成可见部分的图元"""
+        index = self.index
+        scale = self.width / (t1 - t0)
+        axis_y = MARGIN_Y + self.chart_height
+
+        # 时间轴
+        step = nice_step((t1 - t0) / 10)
+        t = ceil(t0 / step) * step
+        while t <= t1:
+            x = MARGIN_X + (t - t0) * scale
+            yield ('line', x, axis_y, x, axis_y + 10)
+            yield ('text', x, axis_y + 15, str(t), 'center', 8)
+            t += step
+
+        # 各泳道的进程条
+        for lane, label in enumerate(index.labels):
+            y = MARGIN_Y + lane * LANE_HEIGHT
+            if label:
+                yield ('text', MARGIN_X - 5, y + 10, label, 'e', 8)
+            for x1, x2, pid, count in index.bars(lane, t0, t1, self.width):
+                x1 += MARGIN_X
+                x2 += MARGIN_X
+                if pid is None:
+                    yield ('rect', x1, y, x2, y + BAR_HEIGHT, AGGREGATE_COLOR, '')
+                    text = f"×{count}"
+                else:
+                    yield ('rect', x1, y, x2, y + BAR_HEIGHT, pid_color(pid), 'black')
+                    text = f"P{pid}"
+                # 放得下才显示标签
+                if x2 - x1 >= len(text) * CHAR_WIDTH + 4:
+                    yield ('text', (x1 + x2) / 2, y + 10, text, 'center', 8)
+
+        # 图例
+        legend_x, legend_y = MARGIN_X, axis_y + 40
+        for pid in index.legend_pids:
+            yield ('rect', legend_x, legend_y, legend_x + 20, legend_y + 15, pid_color(pid), 'black')
+            yield ('text', legend_x + 25, legend_y + 7, f"P{pid}", 'w', 8)
+            legend_x += 60
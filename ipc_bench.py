@@ -0,0 +1,370 @@
+"""IPC 传输基准测试
+
+让一对生产者/消费者通过不同的传输方式收发消息，按负载大小和批大小扫描，
+报告吞吐量以及单向延迟的 p50/p99/p99.9：
+
+- queue: 同一进程内两个线程之间的 queue.Queue
+- mp_queue: multiprocessing.Queue（负载经 pickle）
+- mp_pipe: multiprocessing.Pipe 的 send_bytes/recv_bytes
+- unix_socket: AF_UNIX 流式套接字对
+- os_pipe: os.pipe 匿名管道
+- shm_ring: 共享内存环形缓冲区（shm_ring.ShmRing）
+
+除 queue 外消费者都是独立的子进程。一批 batch 条负载拼成一条消息发送，消息
+前 8 字节写入发送时刻（time.monotonic_ns，Linux 上各进程共用同一时钟），
+消费者收到后把 now - 发送时刻 记 batch 次到 HDR 风格的对数-线性直方图中。
+queue、mp_queue 和 shm_ring 的深度限制为 --depth 条消息，对应演示中的有界
+缓冲区（shm_ring 另外不超过 SHM_RING_BYTES 字节，至少容纳一条消息）；管道和
+套接字由内核缓冲区限制。生产者不限速，测得的延迟包含消息在
+满缓冲区中的排队时间。
+
+--ring-batching 另外测量演示所用的 RingBuffer 在两个线程之间逐条 put/get 与
+put_many/get_many 批量收发的吞吐量对比。
+
+    python ipc_bench.py -o ipc.json
+    python ipc_bench.py --transports shm_ring os_pipe --payloads 64 4096 --batches 1 32
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import socket
+import struct
+import sys
+import threading
+import time
+from ring_buffer import RingBuffer
+from shm_ring import ShmRing, record_size
+
+DEFAULT_PAYLOADS = (16, 256, 4096, 65536, 2 ** 20)
+DEFAULT_BATCHES = (1, 16, 64)
+DEFAULT_DEPTH = 64
+DEFAULT_RING_BATCHES = (1, 8, 64)
+# IPC 选项卡中“传输基准”按钮使用的快速扫描
+QUICK_SWEEP = {'payloads': (16, 4096, 65536, 2 ** 20), 'batches': (1, 16), 'total_bytes': 8 * 2 ** 20}
+COLUMNS = ('transport', 'payload', 'batch', 'msgs_per_sec', 'mb_per_sec', 'p50_us', 'p99_us', 'p999_us')
+MAX_MESSAGE = 8 * 2 ** 20       # 负载 × 批大小超过此值的组合跳过
+SHM_RING_BYTES = 4 * 2 ** 20    # 共享内存环的容量上限，避免大消息时占满 /dev/shm
+STAMP = struct.Struct('<q')
+
+CTX = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods()
+                                  else None)
+
+
+class LatencyHistogram:
+    """HDR 风格的对数-线性直方图（纳秒）
+
+    每个 2 的幂区间再等分为 2^(sub_bits-1) 个桶，相对误差不超过 2^(1-sub_bits)，
+    默认约 1.6%。计数保存在按需增长的列表中，可以合并，也可以转成稀疏字典写入 JSON。
+    """
+
+    def __init__(self, sub_bits=7):
+        self.sub_bits = sub_bits
+        self.counts = []
+        self.total = 0
+        self.max = 0
+
+    def index(self, value):
+        shift = max(0, value.bit_length() - self.sub_bits)
+        return (shift << self.sub_bits) | (value >> shift)
+
+    def value_at(self, index):
+        """桶内的最大值"""
+        shift = index >> self.sub_bits
+        sub = index & ((1 << self.sub_bits) - 1)
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value, count=1):
+        value = max(0, value)
+        i = self.index(value)
+        if i >= len(self.counts):
+            self.counts.extend([0] * (i + 1 - len(self.counts)))
+        self.counts[i] += count
+        self.total += count
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q):
+        """第 q 百分位数（纳秒），没有样本时返回 0"""
+        if not self.total:
+            return 0
+        rank = max(1, int(q / 100 * self.total + 0.5))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.value_at(i), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {'sub_bits': self.sub_bits, 'max': self.max,
+                'counts': {str(i): c for i, c in enumerate(self.counts) if c}}
+
+
+def _read_exact(read_into, view):
+    """用 read_into(memoryview) 读满 view；对端关闭时抛出 EOFError"""
+    got = 0
+    while got < len(view):
+        n = read_into(view[got:])
+        if not n:
+            raise EOFError()
+        got += n
+
+
+# 每种传输：make(size, depth) 返回 (发送函数, 消费者端点, 关闭函数)；
+# receiver(endpoint, size) 在消费者一侧返回 "把一条消息读入 buffer" 的函数。
+
+def _make_queue(size, depth):
+    q = queue.Queue(maxsize=depth)
+    return (lambda buf: q.put(bytes(buf))), q, lambda: None
+
+
+def _recv_queue(q, size):
+    def recv(buffer):
+        buffer[:size] = q.get()
+    return recv
+
+
+def _make_mp_queue(size, depth):
+    q = CTX.Queue(maxsize=depth)
+    def close():
+        q.close()
+        q.join_thread()
+    return (lambda buf: q.put(bytes(buf))), q, close
+
+
+def _make_mp_pipe(size, depth):
+    reader, writer = CTX.Pipe(duplex=False)
+    def close():
+        writer.close()
+        reader.close()
+    return writer.send_bytes, reader, close
+
+
+def _recv_mp_pipe(reader, size):
+    return lambda buffer: reader.recv_bytes_into(buffer)
+
+
+def _make_unix_socket(size, depth):
+    sender, receiver = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    def close():
+        sender.close()
+        receiver.close()
+    return sender.sendall, receiver, close
+
+
+def _recv_unix_socket(receiver, size):
+    return lambda buffer: _read_exact(receiver.recv_into, memoryview(buffer)[:size])
+
+
+def _make_os_pipe(size, depth):
+    reader, writer = os.pipe()
+    def send(buf):
+        view = memoryview(buf)
+        while view:
+            view = view[os.write(writer, view):]
+    def close():
+        os.close(writer)
+        os.close(reader)
+    return send, reader, close
+
+
+def _recv_os_pipe(reader, size):
+    return lambda buffer: _read_exact(lambda view: os.readv(reader, [view]),
+                                      memoryview(buffer)[:size])
+
+
+def _make_shm_ring(size, depth):
+    ring = ShmRing(max(record_size(size), min(max(2, depth) * record_size(size), SHM_RING_BYTES)), CTX)
+    return ring.put, ring, ring.release
+
+
+def _recv_shm_ring(ring, size):
+    return ring.get_into
+
+
+TRANSPORTS = {
+    'queue': (_make_queue, _recv_queue),
+    'mp_queue': (_make_mp_queue, _recv_queue),
+    'mp_pipe': (_make_mp_pipe, _recv_mp_pipe),
+    'unix_socket': (_make_unix_socket, _recv_unix_socket),
+    'os_pipe': (_make_os_pipe, _recv_os_pipe),
+    'shm_ring': (_make_shm_ring, _recv_shm_ring),
+}
+if not hasattr(socket, 'AF_UNIX'):
+    del TRANSPORTS['unix_socket']
+THREAD_TRANSPORTS = ('queue',)
+
+
+def _consume(transport, endpoint, size, batch, messages, result):
+    """消费者：收满 messages 条消息，返回 (直方图, 最后一条到达时刻)"""
+    recv = TRANSPORTS[transport][1](endpoint, size)
+    buffer = bytearray(size)
+    histogram = LatencyHistogram()
+    for _ in range(messages):
+        recv(buffer)
+        histogram.record(time.monotonic_ns() - STAMP.unpack_from(buffer)[0], batch)
+    result.send((histogram, time.monotonic_ns()))
+    result.close()
+
+
+def message_count(payload, batch, total_bytes, min_messages=100, max_messages=20000):
+    """每组测量发送的消息数：总字节数约为 total_bytes，限制在 [min, max] 之间"""
+    return max(min_messages, min(max_messages, total_bytes // (payload * batch)))
+
+
+def run_one(transport, payload, batch, depth=DEFAULT_DEPTH, total_bytes=64 * 2 ** 20):
+    """测量一组 (传输, 负载大小, 批大小)，返回结果字典"""
+    size = max(STAMP.size, payload * batch)
+    messages = message_count(payload, batch, total_bytes)
+    send, endpoint, close = TRANSPORTS[transport][0](size, depth)
+    message = bytearray(size)
+    result_reader, result_writer = CTX.Pipe(duplex=False)
+    args = (transport, endpoint, size, batch, messages, result_writer)
+    if transport in THREAD_TRANSPORTS:
+        consumer = threading.Thread(target=_consume, args=args, daemon=True)
+    else:
+        consumer = CTX.Process(target=_consume, args=args, daemon=True)
+    consumer.start()
+    if transport not in THREAD_TRANSPORTS:
+        # 父进程不再持有写端，消费者进程异常退出时 recv 抛出 EOFError 而不是一直等待
+        result_writer.close()
+    try:
+        start = time.monotonic_ns()
+        for _ in range(messages):
+            STAMP.pack_into(message, 0, time.monotonic_ns())
+            send(message)
+        histogram, end = result_reader.recv()
+    finally:
+        consumer.join()
+        result_reader.close()
+        close()
+    seconds = (end - start) / 1e9
+    count = messages * batch
+    return {
+        'transport': transport, 'payload': payload, 'batch': batch, 'messages': count,
+        'seconds': seconds,
+        'msgs_per_sec': count / seconds,
+        'mb_per_sec': count * payload / seconds / 1e6,
+        'p50_us': histogram.percentile(50) / 1e3,
+        'p99_us': histogram.percentile(99) / 1e3,
+        'p999_us': histogram.percentile(99.9) / 1e3,
+        'max_us': histogram.max / 1e3,
+        'histogram': histogram.to_dict(),
+    }
+
+
+def run_benchmarks(transports=None, payloads=DEFAULT_PAYLOADS, batches=DEFAULT_BATCHES,
+                   depth=DEFAULT_DEPTH, total_bytes=64 * 2 ** 20, log=None):
+    """扫描全部组合，返回可写成 JSON 的结果"""
+    results = []
+    for payload in payloads:
+        for batch in batches:
+            if payload * batch > MAX_MESSAGE:
+                continue
+            for transport in transports or TRANSPORTS:
+                entry = run_one(transport, payload, batch, depth, total_bytes)
+                results.append(entry)
+                if log:
+                    log(entry)
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'depth': depth,
+        'results': results,
+    }
+
+
+def _ring_transfer(capacity, batch, messages):
+    """两个线程经 RingBuffer 传输 messages 条消息，返回耗时（秒）"""
+    buffer = RingBuffer(capacity)
+    items = [None] * batch
+
+    def produce():
+        sent = 0
+        while sent < messages:
+            if batch == 1:
+                buffer.put(sent)
+                sent += 1
+                continue
+            pending = items[:min(batch, messages - sent)]
+            while pending:
+                n = buffer.put_many(pending)
+                pending = pending[n:]
+                sent += n
+
+    producer = threading.Thread(target=produce, daemon=True)
+    start = time.perf_counter()
+    producer.start()
+    received = 0
+    while received < messages:
+        if batch == 1:
+            buffer.get()
+            received += 1
+        else:
+            received += len(buffer.get_many(batch))
+    producer.join()
+    return time.perf_counter() - start
+
+
+def run_batching(batches=DEFAULT_RING_BATCHES, capacity=DEFAULT_DEPTH, messages=200000):
+    """逐条收发（批大小 1）与批量收发的吞吐量对比，speedup 相对批大小 1"""
+    rows = []
+    for batch in batches:
+        seconds = _ring_transfer(capacity, batch, messages)
+        rows.append({'batch': batch, 'messages': messages, 'seconds': seconds,
+                     'msgs_per_sec': messages / seconds})
+    base = next((row['msgs_per_sec'] for row in rows if row['batch'] == 1), rows[0]['msgs_per_sec'])
+    for row in rows:
+        row['speedup'] = row['msgs_per_sec'] / base
+    return rows
+
+
+def print_entry(entry):
+    print(f"{entry['transport']:>12} {entry['payload']:>8}B x{entry['batch']:<3} "
+          f"{entry['msgs_per_sec']:>12,.0f} msg/s {entry['mb_per_sec']:>9.1f} MB/s "
+          f"p50 {entry['p50_us']:9.1f} p99 {entry['p99_us']:9.1f} p99.9 {entry['p999_us']:9.1f} us",
+          file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IPC 传输基准测试")
+    parser.add_argument('--transports', nargs='+', choices=list(TRANSPORTS))
+    parser.add_argument('--payloads', nargs='+', type=int, default=list(DEFAULT_PAYLOADS),
+                        help="负载大小（字节）")
+    parser.add_argument('--batches', nargs='+', type=int, default=list(DEFAULT_BATCHES),
+                        help="每条消息包含的负载数")
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH, help="队列深度（消息数）")
+    parser.add_argument('--bytes', type=int, default=64 * 2 ** 20,
+                        help="每组测量大约发送的字节数")
+    parser.add_argument('--ring-batching', nargs='*', type=int, metavar='K',
+                        help="测量 RingBuffer 逐条与批量收发的吞吐量（默认 K=1 8 64）")
+    parser.add_argument('-o', '--output', help="结果 JSON 文件（默认输出到标准输出）")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.transports, args.payloads, args.batches, args.depth,
+                            args.bytes, log=print_entry)
+    if args.ring_batching is not None:
+        report['ring_batching'] = run_batching(args.ring_batching or DEFAULT_RING_BATCHES, args.depth)
+        for row in report['ring_batching']:
+            print(f"  RingBuffer K={row['batch']:<4} {row['msgs_per_sec']:>12,.0f} msg/s "
+                  f"({row['speedup']:.1f}x)", file=sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,53 @@
 import tkinter as tk
 from tkinter import ttk
+from tkinter import messagebox
+import itertools
 import threading
-import time
-import queue
 from visualization import IPCVisualization
+from ring_buffer import RingBuffer, BufferClosed, RateMeter
+from shm_ring import ShmIPC
+from async_ipc import AsyncIPC, percentile_from_counts
+from ipc_bench import run_benchmarks, run_batching, QUICK_SWEEP, COLUMNS as BENCH_COLUMNS
+
+MODES = ['线程', '共享内存进程', 'asyncio协程']
+BARS = '▁▂▃▄▅▆▇█'
+BENCH_HEADINGS = {
+    'transport': '传输方式', 'payload': '负载(B)', 'batch': '批大小', 'msgs_per_sec': '条/秒',
+    'mb_per_sec': 'MB/秒', 'p50_us': 'p50(μs)', 'p99_us': 'p99(μs)', 'p999_us': 'p99.9(μs)',
+}
 
 class IPCDemo:
-    def __init__(self, parent, status_var):
+    def __init__(self, parent, status_var, render_loop):
         self.parent = parent
         self.status_var = status_var
-        self.message_queue = queue.Queue(maxsize=10)
-        self.buffer = []
-        self.buffer_size = 5
-        self.running = False
+        self.buffer = RingBuffer(5)
+        self.workers = []
+        self.stop_event = threading.Event()
+        self.sequence = itertools.count()
+        self.produce_rate = RateMeter()
+        self.consume_rate = RateMeter()
+        self.byte_rate = RateMeter()
+        # 共享内存进程模式和 asyncio 模式：后端在首次启动时创建，界面按采样重绘
+        self.shm = None
+        self.aio = None
+        self.sample_counts = (0, 0)
+        self.batch_size = 1
+        # 最近一次通信事件 (角色, 消息, 状态栏文字)，由重绘循环显示
+        self.last_event = None
         
         self.setup_ui()
         self.visualization = IPCVisualization(self.canvas)
+        
+        self.render_loop = render_loop
+        self.render_loop.register(self.parent, self.refresh)
+    
+    @property
+    def shm_mode(self):
+        return self.mode.get() == '共享内存进程'
+    
+    @property
+    def async_mode(self):
+        return self.mode.get() == 'asyncio协程'
     
     def setup_ui(self):
         """设置IPC界面"""
@@ -29,6 +61,29 @@ class IPCDemo:
                   command=self.start_consumer).pack(side='left', padx=5)
         ttk.Button(control_frame, text="停止所有", 
                   command=self.stop_all).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="传输基准", 
+                  command=self.run_benchmark).pack(side='left', padx=5)
+        
+        # 生产者/消费者参数，间隔为 0 表示尽可能快
+        param_frame = ttk.LabelFrame(self.parent, text="参数")
+        param_frame.pack(fill='x', padx=5, pady=5)
+        
+        self.producer_count = self.add_param(param_frame, "生产者数:", "1", 0)
+        self.consumer_count = self.add_param(param_frame, "消费者数:", "1", 2)
+        self.produce_interval = self.add_param(param_frame, "生产间隔(秒):", "1.5", 4)
+        self.consume_interval = self.add_param(param_frame, "消费间隔(秒):", "2", 6)
+        self.buffer_capacity = self.add_param(param_frame, "缓冲区大小:", "5", 8)
+        
+        # 共享内存进程模式：生产者和消费者是独立进程，记录长度在范围内随机
+        ttk.Label(param_frame, text="模式:").grid(row=1, column=0, padx=5)
+        self.mode = ttk.Combobox(param_frame, values=MODES, width=12, state='readonly')
+        self.mode.set('线程')
+        self.mode.grid(row=1, column=1, padx=5)
+        self.mode.bind('<<ComboboxSelected>>', lambda e: self.change_mode())
+        self.record_sizes = self.add_param(param_frame, "记录大小(字节):", "64-1024", 2, row=1)
+        self.shm_size = self.add_param(param_frame, "共享内存(KB):", "64", 4, row=1)
+        # 线程模式下每次 put_many/get_many 最多传输的条数，1 表示逐条收发
+        self.batch_entry = self.add_param(param_frame, "批大小:", "1", 6, row=1)
         
         # 消息输入
         msg_frame = ttk.Frame(self.parent)
@@ -60,99 +115,356 @@ class IPCDemo:
         
         self.produced_var = tk.StringVar(value="生产消息: 0")
         self.consumed_var = tk.StringVar(value="消费消息: 0")
+        self.throughput_var = tk.StringVar(value="吞吐量: 0.0 / 0.0 条/秒")
         
         ttk.Label(stats_frame, textvariable=self.produced_var).pack(side='left', padx=10)
         ttk.Label(stats_frame, textvariable=self.consumed_var).pack(side='left', padx=10)
+        ttk.Label(stats_frame, textvariable=self.throughput_var).pack(side='left', padx=10)
         
-        self.produced_count = 0
-        self.consumed_count = 0
+        # asyncio 模式：事件循环延迟和队列深度分布
+        self.loop_var = tk.StringVar(value="")
+        ttk.Label(self.parent, textvariable=self.loop_var).pack(fill='x', padx=15)
+    
+    def add_param(self, frame, label, default, column, row=0):
+        """在参数面板中添加一个输入框"""
+        ttk.Label(frame, text=label).grid(row=row, column=column, padx=5)
+        entry = ttk.Entry(frame, width=8 if row else 6)
+        entry.insert(0, default)
+        entry.grid(row=row, column=column + 1, padx=5)
+        return entry
+    
+    def read_params(self, count_entry, interval_entry):
+        """读取线程数和间隔，无效时提示并返回 None"""
+        try:
+            count = int(count_entry.get())
+            interval = float(interval_entry.get())
+            capacity = int(self.buffer_capacity.get())
+            batch_size = int(self.batch_entry.get())
+            if count < 1 or interval < 0 or capacity < 1 or batch_size < 1:
+                raise ValueError
+            if self.shm_mode:
+                self.prepare_shm(int(float(self.shm_size.get()) * 1024))
+            if self.async_mode:
+                self.prepare_async(capacity)
+        except ValueError:
+            messagebox.showerror("错误", "请输入有效的数字")
+            return None
+        self.resize_buffer(capacity)
+        if not any(w.is_alive() for w in self.workers):
+            self.batch_size = batch_size
+            self.sample_counts = (self.buffer.put_count, self.buffer.get_count)
+        return count, interval
+    
+    def read_sizes(self):
+        """读取记录大小，格式为 “最小-最大” 或单个数字"""
+        low, _, high = self.record_sizes.get().partition('-')
+        return int(low), int(high or low)
+    
+    def prepare_shm(self, capacity):
+        """没有子进程时按需（重新）创建共享内存缓冲区"""
+        if self.shm is not None and (self.shm.capacity == (capacity + 7) & ~7 or self.shm.alive()):
+            return
+        if self.shm is not None:
+            self.shm.release()
+        self.shm = ShmIPC(capacity, on_sample=lambda: self.render_loop.mark_dirty(self.parent))
+        self.sample_counts = (0, 0)
+        self.reset_rates(0, 0)
+    
+    def prepare_async(self, capacity):
+        """没有协程时按需（重新）创建 asyncio 事件循环和队列"""
+        if self.aio is not None and (self.aio.capacity == capacity or self.aio.workers):
+            return
+        if self.aio is not None:
+            self.aio.release()
+        self.aio = AsyncIPC(capacity, on_sample=lambda: self.render_loop.mark_dirty(self.parent))
+        self.sample_counts = (0, 0)
+        self.reset_rates(0, 0)
+    
+    def resize_buffer(self, capacity):
+        """没有工作线程时按新容量重建缓冲区，保留已有消息和计数"""
+        if capacity == self.buffer.capacity or any(w.is_alive() for w in self.workers):
+            return
+        old = self.buffer
+        self.buffer = RingBuffer(capacity)
+        for item in old.snapshot()[:capacity]:
+            self.buffer.put(item)
+        self.buffer.put_count = old.put_count
+        self.buffer.get_count = old.get_count + max(0, len(old) - capacity)
+    
+    def start_workers(self, target, count, interval):
+        self.stop_event.clear()
+        for _ in range(count):
+            worker = threading.Thread(target=target, args=(interval, self.batch_size), daemon=True)
+            worker.start()
+            self.workers.append(worker)
     
     def start_producer(self):
-        """启动生产者线程"""
-        self.running = True
-        producer = threading.Thread(target=self.producer_worker)
-        producer.daemon = True
-        producer.start()
-        self.status_var.set("生产者已启动")
+        """启动生产者线程（共享内存模式下为生产者进程）"""
+        params = self.read_params(self.producer_count, self.produce_interval)
+        if params is None:
+            return
+        if self.shm_mode:
+            try:
+                self.shm.start_producers(*params, self.read_sizes())
+            except ValueError as e:
+                messagebox.showerror("错误", str(e) or "请输入有效的记录大小")
+                return
+            self.status_var.set(f"已启动 {params[0]} 个生产者进程")
+            return
+        if self.async_mode:
+            self.aio.start_producers(*params)
+            self.status_var.set(f"已启动 {params[0]} 个生产者协程")
+            return
+        self.start_workers(self.producer_worker, *params)
+        self.status_var.set(f"已启动 {params[0]} 个生产者")
     
     def start_consumer(self):
-        """启动消费者线程"""
-        self.running = True
-        consumer = threading.Thread(target=self.consumer_worker)
-        consumer.daemon = True
-        consumer.start()
-        self.status_var.set("消费者已启动")
-    
-    def producer_worker(self):
-        """生产者工作函数"""
+        """启动消费者线程（共享内存模式下为消费者进程）"""
+        params = self.read_params(self.consumer_count, self.consume_interval)
+        if params is None:
+            return
+        if self.shm_mode:
+            self.shm.start_consumers(*params)
+            self.status_var.set(f"已启动 {params[0]} 个消费者进程")
+            return
+        if self.async_mode:
+            self.aio.start_consumers(*params)
+            self.status_var.set(f"已启动 {params[0]} 个消费者协程")
+            return
+        self.start_workers(self.consumer_worker, *params)
+        self.status_var.set(f"已启动 {params[0]} 个消费者")
+    
+    def producer_worker(self, interval, batch_size=1):
+        """生产者工作函数：缓冲区满时阻塞在 put 上，批大小大于 1 时用 put_many"""
         messages = ["数据A", "数据B", "数据C", "数据D", "数据E"]
         message_index = 0
         
-        while self.running:
+        while not self.stop_event.is_set():
+            batch = [f"{messages[(message_index + i) % len(messages)]}_{next(self.sequence)}"
+                     for i in range(batch_size)]
+            message = batch[-1]
             try:
-                if len(self.buffer) < self.buffer_size:
-                    message = f"{messages[message_index]}_{self.produced_count}"
-                    self.buffer.append(message)
-                    self.produced_count += 1
-                    
-                    # 更新UI
-                    self.parent.after(0, self.update_display)
-                    self.parent.after(0, lambda: self.visualization.update_communication(
-                        "producer", message, self.buffer
-                    ))
-                    
-                    message_index = (message_index + 1) % len(messages)
-                    self.status_var.set(f"生产消息: {message}")
-                
-                time.sleep(1.5)  # 生产间隔
-                
-            except Exception as e:
+                if batch_size == 1:
+                    self.buffer.put(message)
+                while batch_size > 1 and batch:
+                    batch = batch[self.buffer.put_many(batch):]
+            except BufferClosed:
+                break
+            
+            # 标记需要重绘
+            self.last_event = ("producer", message, f"生产消息: {message}")
+            self.render_loop.mark_dirty(self.parent)
+            message_index = (message_index + batch_size) % len(messages)
+            
+            if interval and self.stop_event.wait(interval):  # 生产间隔
                 break
     
-    def consumer_worker(self):
-        """消费者工作函数"""
-        while self.running:
+    def consumer_worker(self, interval, batch_size=1):
+        """消费者工作函数：缓冲区空时阻塞在 get 上，批大小大于 1 时用 get_many"""
+        while not self.stop_event.is_set():
             try:
-                if self.buffer:
-                    message = self.buffer.pop(0)
-                    self.consumed_count += 1
-                    
-                    # 更新UI
-                    self.parent.after(0, self.update_display)
-                    self.parent.after(0, lambda: self.visualization.update_communication(
-                        "consumer", message, self.buffer
-                    ))
-                    
-                    self.status_var.set(f"消费消息: {message}")
-                
-                time.sleep(2)  # 消费间隔
-                
-            except Exception as e:
+                if batch_size == 1:
+                    message = self.buffer.get()
+                else:
+                    message = self.buffer.get_many(batch_size)[-1]
+            except BufferClosed:
+                break
+            
+            # 标记需要重绘
+            self.last_event = ("consumer", message, f"消费消息: {message}")
+            self.render_loop.mark_dirty(self.parent)
+            
+            if interval and self.stop_event.wait(interval):  # 消费间隔
                 break
     
     def send_message(self):
-        """手动发送消息"""
+        """手动发送消息（缓冲区满时不等待）"""
         message = self.message_entry.get().strip()
-        if message and len(self.buffer) < self.buffer_size:
-            self.buffer.append(message)
-            self.produced_count += 1
-            self.update_display()
-            self.visualization.update_communication("manual", message, self.buffer)
+        if message and self.shm_mode:
+            try:
+                self.prepare_shm(int(float(self.shm_size.get()) * 1024))
+            except ValueError:
+                messagebox.showerror("错误", "请输入有效的数字")
+                return
+            if self.shm.send(message):
+                self.shm.sample_now()
+                self.refresh()
+                self.message_entry.delete(0, 'end')
+            return
+        if message and self.async_mode:
+            try:
+                self.prepare_async(max(1, int(self.buffer_capacity.get())))
+            except ValueError:
+                messagebox.showerror("错误", "请输入有效的数字")
+                return
+            if self.aio.send(message):
+                self.message_entry.delete(0, 'end')
+            return
+        if message and self.buffer.put(message, timeout=0):
+            self.last_event = ("manual", message, f"手动发送: {message}")
+            self.refresh()
             self.message_entry.delete(0, 'end')
-            self.status_var.set(f"手动发送: {message}")
     
     def stop_all(self):
-        """停止所有线程"""
-        self.running = False
+        """停止所有线程和子进程：唤醒阻塞者并等待它们退出"""
+        self.stop_event.set()
+        self.buffer.close()
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+        self.buffer.reopen()
+        if self.shm is not None:
+            self.shm.stop()
+        if self.aio is not None:
+            self.aio.stop()
+        if self.shm_mode and self.shm is not None:
+            stats = self.shm.sample[0]
+            self.reset_rates(stats['put_count'], stats['get_count'], stats['get_bytes'])
+        elif self.async_mode and self.aio is not None:
+            self.reset_rates(self.aio.put_count, self.aio.get_count)
+        else:
+            self.reset_rates(self.buffer.put_count, self.buffer.get_count)
+        self.refresh()
         self.status_var.set("IPC通信已停止")
     
-    def update_display(self):
+    def run_benchmark(self):
+        """在后台线程中对各种 IPC 传输方式做一次快速基准测试"""
+        self.status_var.set("正在测试各种 IPC 传输方式的吞吐量和延迟...")
+        threading.Thread(target=self.benchmark_worker, daemon=True).start()
+    
+    def benchmark_worker(self):
+        """后台线程：运行基准并把结果交回主线程显示"""
+        try:
+            report = run_benchmarks(**QUICK_SWEEP)
+            batching = run_batching()
+        except Exception as e:
+            self.parent.after(0, lambda error=e: self.show_benchmark_error(error))
+            return
+        self.parent.after(0, lambda: self.show_benchmark(report['results'], batching))
+    
+    def show_benchmark_error(self, error):
+        messagebox.showerror("错误", f"IPC 传输基准失败: {error}")
+        self.status_var.set("IPC 传输基准失败")
+    
+    def show_benchmark(self, rows, batching=()):
+        """在新窗口中显示基准结果"""
+        window = tk.Toplevel(self.parent)
+        window.title("IPC 传输基准")
+        
+        tree = ttk.Treeview(window, columns=BENCH_COLUMNS, show='headings', height=min(len(rows), 30))
+        for col in BENCH_COLUMNS:
+            tree.heading(col, text=BENCH_HEADINGS[col])
+            tree.column(col, width=100)
+        for row in rows:
+            tree.insert('', 'end', values=[
+                f"{row[col]:,.1f}" if isinstance(row[col], float) else row[col]
+                for col in BENCH_COLUMNS
+            ])
+        tree.pack(fill='both', expand=True, padx=5, pady=5)
+        
+        # 共享缓冲区逐条收发与批量收发的对比
+        if batching:
+            ttk.Label(window, text="共享缓冲区批量收发: " + "，".join(
+                f"K={row['batch']} {row['msgs_per_sec']:,.0f} 条/秒 ({row['speedup']:.1f}x)"
+                for row in batching)).pack(anchor='w', padx=5, pady=5)
+        
+        self.status_var.set(f"完成 {len(rows)} 组 IPC 传输基准")
+    
+    def change_mode(self):
+        """切换线程、共享内存进程和 asyncio 模式，先停止当前模式下的所有工作者"""
+        self.stop_all()
+        if not self.shm_mode and self.shm is not None:
+            self.shm.release()
+            self.shm = None
+        if not self.async_mode and self.aio is not None:
+            self.aio.release()
+            self.aio = None
+        self.loop_var.set("")
+        self.last_event = None
+        self.sample_counts = (self.buffer.put_count, self.buffer.get_count)
+        self.reset_rates(self.buffer.put_count, self.buffer.get_count)
+        self.visualization.update_communication(None, "", [])
+        self.refresh()
+        self.status_var.set(f"切换到{self.mode.get()}模式")
+    
+    def reset_rates(self, produced, consumed, consumed_bytes=0):
+        self.produce_rate.reset(produced)
+        self.consume_rate.reset(consumed)
+        self.byte_rate.reset(consumed_bytes)
+    
+    def refresh(self):
+        """重绘缓冲区、统计信息和通信图"""
+        if self.shm_mode:
+            self.refresh_shm()
+            return
+        if self.async_mode:
+            self.refresh_async()
+            return
+        snapshot = self.buffer.snapshot()
+        self.update_display(snapshot, self.buffer.put_count, self.buffer.get_count)
+        if self.batch_size > 1:
+            self.draw_sampled(self.buffer.put_count, self.buffer.get_count, snapshot, "批量收发")
+        elif self.last_event is not None:
+            role, message, status = self.last_event
+            self.visualization.update_communication(role, message, snapshot)
+            self.status_var.set(status)
+    
+    def refresh_shm(self):
+        """按后台线程最近一次采样重绘共享内存模式，箭头显示两次采样间的传输条数"""
+        if self.shm is None:
+            self.update_display([], 0, 0)
+            return
+        stats, records, _ = self.shm.sample
+        produced, consumed = stats['put_count'], stats['get_count']
+        snapshot = [label for _, label in records]
+        self.update_display([f"{label} ({length}B)" for length, label in records], produced, consumed,
+                            f" | {self.byte_rate.update(stats['get_bytes']) / 1e6:.1f} MB/s"
+                            f" | 占用 {stats['used']}/{stats['capacity']} 字节")
+        
+        self.draw_sampled(produced, consumed, snapshot, "共享内存")
+    
+    def refresh_async(self):
+        """按事件循环最近一次采样重绘 asyncio 模式，并显示循环延迟和队列深度分布"""
+        if self.aio is None:
+            self.update_display([], 0, 0)
+            return
+        sample = self.aio.sample
+        produced, consumed = sample['put_count'], sample['get_count']
+        self.update_display(sample['items'], produced, consumed,
+                            f" | 协程 {sample['producers']} / {sample['consumers']}"
+                            f" | 队列 {sample['count']}/{sample['capacity']}")
+        
+        depths = sample['depths']
+        width = -(-len(depths) // len(BARS))
+        buckets = [sum(depths[i:i + width]) for i in range(0, len(depths), width)]
+        peak = max(buckets) or 1
+        bars = ''.join(BARS[min(len(BARS) - 1, count * len(BARS) // peak)] if count else ' '
+                       for count in buckets)
+        self.loop_var.set(
+            f"循环延迟: {sample['lag_last'] * 1000:.1f} ms (p99 {sample['lag_p99'] * 1000:.1f}, "
+            f"最大 {sample['lag_max'] * 1000:.1f})    队列深度 p50/p90/p99: "
+            + '/'.join(str(percentile_from_counts(depths, q)) for q in (50, 90, 99))
+            + f"    分布 0[{bars}]{sample['capacity']}")
+        self.draw_sampled(produced, consumed, sample['items'], "asyncio")
+    
+    def draw_sampled(self, produced, consumed, snapshot, name):
+        """采样和批量模式的通信图：两个方向的汇总箭头显示两次重绘之间传输的条数"""
+        put_delta = produced - self.sample_counts[0]
+        get_delta = consumed - self.sample_counts[1]
+        self.sample_counts = (produced, consumed)
+        self.visualization.update_flow(put_delta, get_delta, snapshot)
+        if put_delta or get_delta:
+            self.status_var.set(f"{name}: 写入 {put_delta} 条, 读出 {get_delta} 条")
+    
+    def update_display(self, snapshot, produced, consumed, detail=""):
         """更新显示"""
         # 更新缓冲区显示
         self.buffer_text.delete('1.0', 'end')
-        for i, item in enumerate(self.buffer):
+        for i, item in enumerate(snapshot):
             self.buffer_text.insert('end', f"[{i}] {item}\n")
         
         # 更新统计信息
-        self.produced_var.set(f"生产消息: {self.produced_count}")
-        self.consumed_var.set(f"消费消息: {self.consumed_count}")
\ No newline at end of file
+        self.produced_var.set(f"生产消息: {produced}")
+        self.consumed_var.set(f"消费消息: {consumed}")
+        self.throughput_var.set(f"吞吐量: {self.produce_rate.update(produced):.1f} / "
+                                f"{self.consume_rate.update(consumed):.1f} 条/秒" + detail)
\ No newline at end of file
@@ -1,45 +1,11 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import threading
-import time
+from tkinter import ttk, messagebox, filedialog
 from process_manager import ProcessManager
 from ipc_demo import IPCDemo
 from semaphore_demo import SemaphoreDemo
 from scheduler import SchedulerDemo
-
-# 进程数据结构（模拟 PCB）
-process = {
-    'pid': self.next_pid,
-    'state': '就绪',  # 初始状态
-    'priority': priority,
-    'exec_time': exec_time,
-    'progress': 0,  # 执行进度（0% → 100%）
-    'thread': None
-}
-
-
-# 启动执行：就绪 → 运行，并创建线程
-def start_execution(self):
-    for p in self.processes:
-        if p['state'] == '就绪':
-            p['state'] = '运行'
-            p['thread'] = threading.Thread(target=self.execute_process, args=(p,))
-            p['thread'].start()
-
-
-# 模拟进程执行（核心状态推进逻辑）
-def execute_process(self, process):
-    while process['progress'] < 100 and self.running:
-        time.sleep(0.1)  # 模拟 CPU 时间片
-        increment = 100 / (process['exec_time'] * 10)
-        process['progress'] += increment
-
-        # 线程安全地更新 UI
-        self.parent.after(0, self.update_process_list)
-        self.parent.after(0, lambda: self.visualization.update_processes(self.processes))
-
-    process['state'] = '完成'  # 运行 → 完成
-
+from render_loop import RenderLoop
+from perf_hud import PerfMonitor
 
 class OSVisualizationPlatform:
     def __init__(self, root):
@@ -55,34 +21,71 @@ class OSVisualizationPlatform:
         self.notebook = ttk.Notebook(root)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
         
+        # 所有选项卡共用的限帧重绘循环，只重绘当前可见的选项卡
+        self.render_loop = RenderLoop(root, self.notebook, fps=20)
+        
         # 初始化各个模块
         self.init_process_tab()
         self.init_ipc_tab()
         self.init_semaphore_tab()
         self.init_scheduler_tab()
+        self.render_loop.start()
         
         # 状态栏
         status_bar = tk.Label(root, textvariable=self.status_var, 
                             relief='sunken', anchor='w')
         status_bar.pack(side='bottom', fill='x')
+        
+        # 渲染性能统计：F12 开关，Shift+F12 导出 CSV
+        self.perf = PerfMonitor(root, self.notebook)
+        self.render_loop.perf = self.perf
+        self.perf_bar = tk.Label(root, textvariable=self.perf.text, relief='sunken',
+                                 anchor='w', fg='blue')
+        root.bind('<F12>', lambda e: self.toggle_perf())
+        root.bind('<Shift-F12>', lambda e: self.export_perf())
+    
+    def toggle_perf(self):
+        """开关渲染性能统计"""
+        self.perf.toggle()
+        if self.perf.enabled:
+            self.perf_bar.pack(side='bottom', fill='x')
+            self.status_var.set("渲染性能统计已开启（Shift+F12 导出 CSV）")
+        else:
+            self.perf_bar.pack_forget()
+            self.status_var.set("渲染性能统计已关闭")
+    
+    def export_perf(self):
+        """导出性能采样为 CSV"""
+        if not self.perf.samples:
+            messagebox.showwarning("警告", "没有性能采样数据，请先按 F12 开启统计")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
+        if not path:
+            return
+        try:
+            self.perf.export_csv(path)
+        except OSError as e:
+            messagebox.showerror("错误", f"导出失败: {e}")
+            return
+        self.status_var.set(f"已导出 {len(self.perf.samples)} 条性能采样: {path}")
     
     def init_process_tab(self):
         """进程线程管理选项卡"""
         self.process_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.process_frame, text="进程线程管理")
-        self.process_manager = ProcessManager(self.process_frame, self.status_var)
+        self.process_manager = ProcessManager(self.process_frame, self.status_var, self.render_loop)
     
     def init_ipc_tab(self):
         """进程间通信选项卡"""
         self.ipc_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.ipc_frame, text="进程间通信")
-        self.ipc_demo = IPCDemo(self.ipc_frame, self.status_var)
+        self.ipc_demo = IPCDemo(self.ipc_frame, self.status_var, self.render_loop)
     
     def init_semaphore_tab(self):
         """信号量同步选项卡"""
         self.semaphore_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.semaphore_frame, text="信号量同步")
-        self.semaphore_demo = SemaphoreDemo(self.semaphore_frame, self.status_var)
+        self.semaphore_demo = SemaphoreDemo(self.semaphore_frame, self.status_var, self.render_loop)
     
     def init_scheduler_tab(self):
         """CPU调度选项卡"""
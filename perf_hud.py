@@ -0,0 +1,203 @@
+"""渲染性能统计（可选开启）
+
+开启后按固定间隔采样：
+- 每个选项卡的重绘次数和耗时（由 RenderLoop 上报）；
+- 每秒创建、删除的画布项数量；
+- 每秒插入、修改、删除的 Treeview 行数；
+- Tk 事件队列中待执行的 after 回调数量；
+- 重绘循环的帧延迟，即 after 回调比预定时间晚了多少。持续增大说明主循环被拖慢。
+
+画布和 Treeview 的计数通过在开启时替换 tk.Canvas / ttk.Treeview 的方法实现，
+关闭时恢复原方法；关闭状态下除 RenderLoop 中的一次属性判断外没有额外开销。
+采样结果保存为时间序列，可导出为 CSV。
+"""
+import csv
+import time
+import tkinter as tk
+from collections import defaultdict
+from tkinter import ttk
+
+
+class PerfMonitor:
+    def __init__(self, root, notebook=None, interval=1000):
+        self.root = root
+        self.notebook = notebook
+        self.interval = interval
+        self.enabled = False
+        self.text = tk.StringVar(value="")
+        self.samples = []
+        self._originals = {}
+        self._after_id = None   # 待执行的采样回调
+        self._reset_window()
+    
+    def _reset_window(self):
+        """清空当前采样窗口的计数"""
+        self.window_start = time.perf_counter()
+        self.redraws = defaultdict(int)
+        self.redraw_time = defaultdict(float)
+        self.redraw_max = defaultdict(float)
+        self.created = defaultdict(int)   # 控件路径 -> 数量
+        self.deleted = defaultdict(int)
+        self.rows = defaultdict(int)
+        self.max_lag = 0.0
+        self.last_tick = None
+    
+    # ---- 开关 ----
+    
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._patch()
+        self._reset_window()
+        self._after_id = self.root.after(self.interval, self.sample)
+    
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        # 取消待执行的采样，否则很快重新开启时会有两条采样链
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._unpatch()
+        self.text.set("")
+    
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+    
+    def _patch(self):
+        """替换画布和 Treeview 的方法以统计操作次数"""
+        monitor = self
+        canvas_create = tk.Canvas._create
+        canvas_delete = tk.Canvas.delete
+        tree_insert = ttk.Treeview.insert
+        tree_item = ttk.Treeview.item
+        tree_delete = ttk.Treeview.delete
+        
+        def create(canvas, *args, **kw):
+            monitor.created[canvas._w] += 1
+            return canvas_create(canvas, *args, **kw)
+        
+        def delete(canvas, *args):
+            monitor.deleted[canvas._w] += sum(len(canvas.find_withtag(tag)) for tag in args)
+            return canvas_delete(canvas, *args)
+        
+        def insert(tree, *args, **kw):
+            monitor.rows[tree._w] += 1
+            return tree_insert(tree, *args, **kw)
+        
+        def item(tree, iid, option=None, **kw):
+            if kw:
+                monitor.rows[tree._w] += 1
+            return tree_item(tree, iid, option, **kw)
+        
+        def delete_rows(tree, *items):
+            monitor.rows[tree._w] += len(items)
+            return tree_delete(tree, *items)
+        
+        self._originals = {
+            (tk.Canvas, '_create'): canvas_create,
+            (tk.Canvas, 'delete'): canvas_delete,
+            (ttk.Treeview, 'insert'): tree_insert,
+            (ttk.Treeview, 'item'): tree_item,
+            (ttk.Treeview, 'delete'): tree_delete,
+        }
+        tk.Canvas._create = create
+        tk.Canvas.delete = delete
+        ttk.Treeview.insert = insert
+        ttk.Treeview.item = item
+        ttk.Treeview.delete = delete_rows
+    
+    def _unpatch(self):
+        for (cls, name), method in self._originals.items():
+            setattr(cls, name, method)
+        self._originals = {}
+    
+    # ---- RenderLoop 上报 ----
+    
+    def record_tick(self, interval):
+        """记录一次重绘循环回调，interval 为预定间隔（秒）"""
+        now = time.perf_counter()
+        if self.last_tick is not None:
+            self.max_lag = max(self.max_lag, now - self.last_tick - interval)
+        self.last_tick = now
+    
+    def record_redraw(self, tab, seconds):
+        """记录一次选项卡重绘"""
+        self.redraws[tab] += 1
+        self.redraw_time[tab] += seconds
+        self.redraw_max[tab] = max(self.redraw_max[tab], seconds)
+    
+    # ---- 采样 ----
+    
+    def tab_name(self, path):
+        """把控件路径归到所在选项卡的标题"""
+        if self.notebook is not None:
+            for tab in self.notebook.tabs():
+                if path == tab or path.startswith(tab + '.'):
+                    return self.notebook.tab(tab, 'text')
+        return '其他'
+    
+    def _by_tab(self, counts, seconds):
+        totals = defaultdict(float)
+        for path, count in counts.items():
+            totals[self.tab_name(path)] += count / seconds
+        return totals
+    
+    def sample(self):
+        """结束当前窗口，记录一行统计并刷新显示"""
+        if not self.enabled:
+            return
+        seconds = max(1e-6, time.perf_counter() - self.window_start)
+        created = self._by_tab(self.created, seconds)
+        deleted = self._by_tab(self.deleted, seconds)
+        rows = self._by_tab(self.rows, seconds)
+        
+        row = {
+            'time': round(time.time(), 3),
+            'items_created_per_s': round(sum(created.values()), 1),
+            'items_deleted_per_s': round(sum(deleted.values()), 1),
+            'tree_rows_per_s': round(sum(rows.values()), 1),
+            'after_pending': len(self.root.tk.splitlist(self.root.tk.call('after', 'info'))),
+            'frame_lag_ms': round(self.max_lag * 1000, 2),
+        }
+        tabs = set(created) | set(deleted) | set(rows) | {self.tab_name(t) for t in self.redraws}
+        for tab in sorted(tabs):
+            redraws = sum(n for t, n in self.redraws.items() if self.tab_name(t) == tab)
+            total = sum(s for t, s in self.redraw_time.items() if self.tab_name(t) == tab)
+            worst = max((s for t, s in self.redraw_max.items() if self.tab_name(t) == tab), default=0.0)
+            row[f'{tab}.redraws'] = redraws
+            row[f'{tab}.redraw_ms'] = round(total * 1000, 2)
+            row[f'{tab}.redraw_max_ms'] = round(worst * 1000, 2)
+            row[f'{tab}.items_created_per_s'] = round(created[tab], 1)
+            row[f'{tab}.items_deleted_per_s'] = round(deleted[tab], 1)
+            row[f'{tab}.tree_rows_per_s'] = round(rows[tab], 1)
+        self.samples.append(row)
+        self.text.set(self.format(row))
+        
+        self._reset_window()
+        self._after_id = self.root.after(self.interval, self.sample)
+    
+    def format(self, row):
+        """状态栏显示的一行摘要"""
+        text = (f"画布项 +{row['items_created_per_s']:.0f}/-{row['items_deleted_per_s']:.0f}/s  "
+                f"表格行 {row['tree_rows_per_s']:.0f}/s  after {row['after_pending']}  "
+                f"帧延迟 {row['frame_lag_ms']:.1f}ms")
+        busiest = max((key for key in row if key.endswith('.redraw_ms')), key=row.get, default=None)
+        if busiest is not None and row[busiest] > 0:
+            text += f"  重绘最久: {busiest[:-len('.redraw_ms')]} {row[busiest]:.1f}ms"
+        return text
+    
+    def export_csv(self, path):
+        """把所有采样写入 CSV，选项卡列取所有采样的并集"""
+        fields = []
+        for row in self.samples:
+            fields.extend(key for key in row if key not in fields)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields, restval=0)
+            writer.writeheader()
+            writer.writerows(self.samples)
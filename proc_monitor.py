@@ -0,0 +1,132 @@
+"""/proc 系统进程监视
+
+后台线程按 1–10 Hz 采样主机上的所有进程：
+- 每个 /proc/<pid>/stat 每次采样只读一次，读入复用的缓冲区；
+- 每个进程对应一个常驻的 PCB 字典，原地更新，CPU 占用率由相邻两次采样的
+  CPU 时间之差增量计算；
+- 命令行等开销较大的字段只在进程首次出现时读取，以 (pid, 启动时间) 为键
+  缓存，PID 被复用时自动失效。
+
+PCB 字典的字段与进程模拟器一致（state/priority/progress/cpu_time/rss_kb），
+另有 cpu_percent、threads 和 cmdline。progress 为 CPU 占用率，用于进度条。
+"""
+import os
+import threading
+import time
+from real_process import CLOCK_TICKS, STATES
+
+PAGE_KB = os.sysconf('SC_PAGE_SIZE') // 1024 if hasattr(os, 'sysconf') else 4
+RATES = (1, 2, 5, 10)
+
+
+class ProcMonitor:
+    def __init__(self, on_sample=None, rate=2):
+        self.on_sample = on_sample
+        self.rate = rate
+        self.processes = []       # 按 PID 排序的 PCB 列表，每次采样整体替换
+        self.pcbs = {}            # pid -> PCB
+        self.sample_time = 0.0    # 上次采样耗时（秒）
+        self.buffer = bytearray(4096)
+        self.stopped = threading.Event()
+        self.thread = None
+        self._last = None
+    
+    def start(self):
+        if self.thread is None:
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+    
+    def stop(self):
+        """停止采样并等待线程退出"""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+    
+    def clear(self):
+        """停止采样并丢弃所有 PCB，下次采样从头计算 CPU 占用率"""
+        self.stop()
+        self.processes = []
+        self.pcbs = {}
+        self.sample_time = 0.0
+        self._last = None
+    
+    def run(self):
+        while True:
+            self.sample()
+            if self.on_sample is not None:
+                self.on_sample()
+            if self.stopped.wait(1 / self.rate):
+                return
+    
+    def _read(self, path, dir_fd):
+        """把文件读入复用缓冲区，返回读取的字节数"""
+        fd = os.open(path, os.O_RDONLY, dir_fd=dir_fd)
+        try:
+            return os.readv(fd, [self.buffer])
+        finally:
+            os.close(fd)
+    
+    def _cmdline(self, pid, comm):
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                cmdline = f.read(256)
+        except OSError:
+            cmdline = b''
+        cmdline = cmdline.replace(b'\0', b' ').strip()
+        return cmdline.decode(errors='replace') if cmdline else f"[{comm}]"
+    
+    def sample(self):
+        """采样一次所有进程"""
+        started = time.perf_counter()
+        now = time.monotonic()
+        elapsed = now - self._last if self._last is not None else None
+        self._last = now
+        
+        buffer = self.buffer
+        pcbs = self.pcbs
+        seen = {}
+        # 相对 /proc 的目录描述符打开各 stat 文件，省去每次解析完整路径
+        proc_fd = os.open('/proc', os.O_RDONLY)
+        try:
+            names = [entry.name for entry in os.scandir(proc_fd) if entry.name.isdigit()]
+            for name in names:
+                try:
+                    n = self._read(name + '/stat', proc_fd)
+                except OSError:
+                    continue  # 进程已退出
+                pid = int(name)
+                # 进程名可能包含空格和括号，从最后一个 ')' 之后开始解析
+                close = buffer.rfind(b')', 0, n)
+                fields = buffer[close + 2:n].split(None, 22)
+                ticks = int(fields[11]) + int(fields[12])
+                start_time = int(fields[19])
+                
+                pcb = pcbs.get(pid)
+                if pcb is None or pcb['start_time'] != start_time:
+                    # 新进程或 PID 被复用：重新读取命令行
+                    comm = buffer[buffer.find(b'(', 0, n) + 1:close].decode(errors='replace')
+                    pcb = {'pid': pid, 'start_time': start_time, 'ticks': ticks,
+                           'cmdline': self._cmdline(pid, comm), 'cpu_percent': 0.0}
+                elif elapsed:
+                    pcb['cpu_percent'] = 100 * (ticks - pcb['ticks']) / (CLOCK_TICKS * elapsed)
+                    pcb['ticks'] = ticks
+                pcb['state'] = STATES.get(chr(fields[0][0]), '阻塞')
+                pcb['priority'] = int(fields[16])
+                pcb['threads'] = int(fields[17])
+                pcb['cpu_time'] = ticks / CLOCK_TICKS
+                pcb['rss_kb'] = int(fields[21]) * PAGE_KB
+                pcb['progress'] = min(100.0, pcb['cpu_percent'])
+                seen[pid] = pcb
+        finally:
+            os.close(proc_fd)
+        
+        # 已退出的进程随旧字典一起丢弃
+        self.pcbs = seen
+        self.processes = [seen[pid] for pid in sorted(seen)]
+        self.sample_time = time.perf_counter() - started
+    
+    def busiest(self, count):
+        """CPU 占用率最高的 count 个进程"""
+        return sorted(self.processes, key=lambda pcb: pcb['cpu_percent'], reverse=True)[:count]
@@ -1,20 +1,54 @@
 import tkinter as tk
-from tkinter import ttk
-import threading
-import time
+from tkinter import ttk, messagebox
 import random
 from visualization import ProcessVisualization
+from tree_sync import TreeSync
+from process_sim import ProcessSimulator, make_pcb
+from sim_clock import SPEEDS
+from real_process import RealProcessPool, SUPPORTED as REAL_SUPPORTED, WORKLOADS
+from proc_monitor import ProcMonitor, RATES
+
+COLUMNS = ('PID', '状态', '优先级', '执行时间', '进度', 'CPU时间', '内存', '上下文切换')
+MONITOR_HEADINGS = ('PID', '状态', 'Nice', '命令', 'CPU%', 'CPU时间', '内存', '线程数')
+# 状态图最多显示的进程数：监视模式取 CPU 占用最高的，其余模式取当前页的前若干个
+STATE_VISIBLE = ProcessVisualization.COLUMNS * 5
+# 进程列表分页显示，每页行数
+PAGE_SIZE = 200
 
 class ProcessManager:
-    def __init__(self, parent, status_var):
+    def __init__(self, parent, status_var, render_loop):
         self.parent = parent
         self.status_var = status_var
-        self.processes = []
         self.next_pid = 1
-        self.running = False
+        self.page = 0
         
         self.setup_ui()
         self.visualization = ProcessVisualization(self.canvas)
+        
+        # 时钟、轮询和采样线程只标记需要重绘，由主窗口共享的限帧循环统一刷新
+        self.render_loop = render_loop
+        self.render_loop.register(self.parent, self.refresh)
+        
+        # 所有进程由一个时钟线程按节拍批量推进
+        self.simulator = ProcessSimulator(on_tick=lambda: self.render_loop.mark_dirty(self.parent))
+        # 真实进程模式：子进程由一个轮询线程批量读取 /proc
+        self.real_pool = RealProcessPool(on_poll=lambda: self.render_loop.mark_dirty(self.parent))
+        # 系统监视模式：后台线程采样 /proc 中的所有进程
+        self.monitor = ProcMonitor(on_sample=lambda: self.render_loop.mark_dirty(self.parent))
+    
+    @property
+    def real_mode(self):
+        return self.mode.get() == '真实进程'
+    
+    @property
+    def monitor_mode(self):
+        return self.mode.get() == '系统监视'
+    
+    @property
+    def processes(self):
+        if self.monitor_mode:
+            return self.monitor.processes
+        return self.real_pool.processes if self.real_mode else self.simulator.processes
     
     def setup_ui(self):
         """设置用户界面"""
@@ -28,6 +62,8 @@ class ProcessManager:
                   command=self.start_execution).pack(side='left', padx=5)
         ttk.Button(control_frame, text="暂停", 
                   command=self.pause_execution).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="单步", 
+                  command=self.step_execution).pack(side='left', padx=5)
         ttk.Button(control_frame, text="重置", 
                   command=self.reset).pack(side='left', padx=5)
         
@@ -45,18 +81,60 @@ class ProcessManager:
         self.priority.insert(0, "1")
         self.priority.grid(row=0, column=3, padx=5)
         
+        ttk.Label(param_frame, text="数量:").grid(row=0, column=4, padx=5)
+        self.count = ttk.Entry(param_frame, width=10)
+        self.count.insert(0, "1")
+        self.count.grid(row=0, column=5, padx=5)
+        
+        ttk.Label(param_frame, text="速度:").grid(row=0, column=6, padx=5)
+        self.speed = ttk.Combobox(param_frame, values=list(SPEEDS), width=8, state='readonly')
+        self.speed.set('1x')
+        self.speed.grid(row=0, column=7, padx=5)
+        self.speed.bind('<<ComboboxSelected>>', lambda e: self.simulator.set_speed(SPEEDS[self.speed.get()]))
+        
+        self.clock_var = tk.StringVar(value="模拟时间: 0.0s")
+        ttk.Label(param_frame, textvariable=self.clock_var).grid(row=0, column=8, padx=5)
+        
+        ttk.Label(param_frame, text="模式:").grid(row=1, column=0, padx=5)
+        self.mode = ttk.Combobox(param_frame, values=['模拟', '真实进程', '系统监视'], width=8, state='readonly')
+        self.mode.set('模拟')
+        self.mode.grid(row=1, column=1, padx=5)
+        self.mode.bind('<<ComboboxSelected>>', lambda e: self.change_mode())
+        
+        ttk.Label(param_frame, text="负载类型:").grid(row=1, column=2, padx=5)
+        self.workload = ttk.Combobox(param_frame, values=list(WORKLOADS), width=8, state='readonly')
+        self.workload.set('CPU密集')
+        self.workload.grid(row=1, column=3, padx=5)
+        
+        ttk.Label(param_frame, text="采样频率(Hz):").grid(row=1, column=4, padx=5)
+        self.sample_rate = ttk.Combobox(param_frame, values=RATES, width=8, state='readonly')
+        self.sample_rate.set('2')
+        self.sample_rate.grid(row=1, column=5, padx=5)
+        self.sample_rate.bind('<<ComboboxSelected>>',
+                              lambda e: setattr(self.monitor, 'rate', int(self.sample_rate.get())))
+        
         # 进程列表
         list_frame = ttk.LabelFrame(self.parent, text="进程列表")
         list_frame.pack(fill='both', expand=True, padx=5, pady=5)
         
-        columns = ('PID', '状态', '优先级', '执行时间', '进度')
-        self.process_tree = ttk.Treeview(list_frame, columns=columns, show='headings')
+        self.process_tree = ttk.Treeview(list_frame, columns=COLUMNS, show='headings')
         
-        for col in columns:
+        for col in COLUMNS:
             self.process_tree.heading(col, text=col)
             self.process_tree.column(col, width=100)
         
+        # 分页：大量进程时 Treeview 只保留当前页的行
+        page_frame = ttk.Frame(list_frame)
+        page_frame.pack(side='bottom', fill='x')
+        ttk.Button(page_frame, text="上一页", 
+                  command=lambda: self.change_page(-1)).pack(side='left', padx=5)
+        ttk.Button(page_frame, text="下一页", 
+                  command=lambda: self.change_page(1)).pack(side='left', padx=5)
+        self.page_var = tk.StringVar(value="第 1/1 页")
+        ttk.Label(page_frame, textvariable=self.page_var).pack(side='left', padx=10)
+        
         self.process_tree.pack(fill='both', expand=True)
+        self.tree_sync = TreeSync(self.process_tree)
         
         # 可视化画布
         canvas_frame = ttk.LabelFrame(self.parent, text="进程状态可视化")
@@ -66,100 +144,170 @@ class ProcessManager:
         self.canvas.pack(fill='both', expand=True)
     
     def create_process(self):
-        """创建新进程"""
+        """创建新进程（可一次创建多个）"""
         try:
             exec_time = int(self.exec_time.get())
             priority = int(self.priority.get())
+            count = max(1, int(self.count.get()))
             
-            process = {
-                'pid': self.next_pid,
-                'state': '就绪',
-                'priority': priority,
-                'exec_time': exec_time,
-                'progress': 0,
-                'thread': None
-            }
+            if self.monitor_mode:
+                messagebox.showinfo("提示", "系统监视模式下不能创建进程")
+                return
+            if self.real_mode:
+                pids = [self.real_pool.spawn(exec_time, priority, WORKLOADS[self.workload.get()])['pid']
+                        for _ in range(count)]
+                self.refresh()
+                self.status_var.set(f"启动子进程 PID: {', '.join(map(str, pids[:10]))}"
+                                    + (" ..." if count > 10 else ""))
+                return
             
-            self.processes.append(process)
-            self.update_process_list()
-            self.visualization.update_processes(self.processes)
+            for _ in range(count):
+                self.simulator.add(make_pcb(self.next_pid, exec_time, priority))
+                self.next_pid += 1
+            self.refresh()
             
-            self.next_pid += 1
-            self.status_var.set(f"创建进程 PID: {process['pid']}")
+            if count == 1:
+                self.status_var.set(f"创建进程 PID: {self.next_pid - 1}")
+            else:
+                self.status_var.set(f"创建进程 PID: {self.next_pid - count}-{self.next_pid - 1}")
             
         except ValueError:
             messagebox.showerror("错误", "请输入有效的数字")
+        except OSError as e:
+            messagebox.showerror("错误", f"无法启动子进程: {e}")
+            self.refresh()
+    
+    def change_mode(self):
+        """切换模拟、真实进程和系统监视模式"""
+        if (self.real_mode or self.monitor_mode) and not REAL_SUPPORTED:
+            messagebox.showerror("错误", f"{self.mode.get()}模式需要 Linux 的 /proc 文件系统")
+            self.mode.set('模拟')
+            return
+        headings = MONITOR_HEADINGS if self.monitor_mode else COLUMNS
+        for col, text in zip(COLUMNS, headings):
+            self.process_tree.heading(col, text=text)
+        if self.monitor_mode:
+            self.monitor.start()
+        else:
+            self.monitor.stop()
+        self.page = 0
+        self.refresh()
+        self.status_var.set(f"切换到{self.mode.get()}模式")
     
     def start_execution(self):
         """开始执行所有进程"""
+        if self.monitor_mode:
+            self.monitor.start()
+            self.status_var.set("继续采样")
+            return
         if not self.processes:
             messagebox.showwarning("警告", "没有可执行的进程")
             return
         
-        self.running = True
-        for process in self.processes:
-            if process['state'] == '就绪':
-                process['state'] = '运行'
-                process['thread'] = threading.Thread(
-                    target=self.execute_process, 
-                    args=(process,)
-                )
-                process['thread'].start()
+        if self.real_mode:
+            self.real_pool.resume()
+            self.status_var.set("向所有子进程发送 SIGCONT")
+            return
         
-        self.update_process_list()
-        self.visualization.update_processes(self.processes)
+        self.simulator.start()
+        self.refresh()
         self.status_var.set("开始执行所有进程")
     
-    def execute_process(self, process):
-        """模拟进程执行"""
-        while process['progress'] < 100 and self.running:
-            time.sleep(0.1)  # 模拟执行时间
-            increment = 100 / (process['exec_time'] * 10)
-            process['progress'] = min(100, process['progress'] + increment)
-            
-            # 更新UI（需要在主线程中执行）
-            self.parent.after(0, self.update_process_list)
-            self.parent.after(0, lambda: self.visualization.update_processes(self.processes))
-            
-            if process['progress'] >= 100:
-                process['state'] = '完成'
-                break
-        
-        self.parent.after(0, self.update_process_list)
-        self.parent.after(0, lambda: self.visualization.update_processes(self.processes))
-    
     def pause_execution(self):
         """暂停执行"""
-        self.running = False
+        if self.monitor_mode:
+            self.monitor.stop()
+            self.status_var.set("采样已暂停")
+            return
+        if self.real_mode:
+            self.real_pool.pause()
+            self.status_var.set("向所有子进程发送 SIGSTOP")
+            return
+        self.simulator.pause()
         self.status_var.set("执行已暂停")
     
+    def step_execution(self):
+        """暂停后单步推进一个节拍"""
+        if self.monitor_mode:
+            self.monitor.stop()
+            self.monitor.sample()
+            self.refresh()
+            self.status_var.set("采样一次")
+            return
+        if self.real_mode:
+            messagebox.showinfo("提示", "真实进程模式不支持单步执行")
+            return
+        self.simulator.pause()
+        if not self.simulator.step():
+            messagebox.showwarning("警告", "没有可执行的进程")
+            return
+        self.status_var.set("单步执行")
+    
     def reset(self):
         """重置所有进程"""
-        self.running = False
-        time.sleep(0.2)  # 等待线程结束
-        
-        for process in self.processes:
-            process['state'] = '就绪'
-            process['progress'] = 0
-            process['thread'] = None
-        
-        self.update_process_list()
-        self.visualization.update_processes(self.processes)
+        self.page = 0
+        if self.monitor_mode:
+            self.monitor.clear()
+            self.refresh()
+            self.status_var.set("采样已停止")
+            return
+        if self.real_mode:
+            self.real_pool.reset()
+            self.refresh()
+            self.status_var.set("已结束所有子进程")
+            return
+        self.simulator.reset()
+        self.refresh()
         self.status_var.set("系统已重置")
     
+    def refresh(self):
+        """重绘进程列表和状态图"""
+        self.update_process_list()
+        if self.monitor_mode:
+            self.visualization.update_processes(self.monitor.busiest(STATE_VISIBLE))
+            self.clock_var.set(f"进程数: {len(self.monitor.processes)}  "
+                               f"采样耗时: {self.monitor.sample_time * 1000:.1f}ms")
+            return
+        start = self.page * PAGE_SIZE
+        self.visualization.update_processes(self.processes[start:start + STATE_VISIBLE])
+        self.clock_var.set(f"模拟时间: {self.simulator.clock.now:.1f}s")
+    
+    def page_rows(self, processes):
+        """当前页的进程，并更新页码显示"""
+        pages = max(1, -(-len(processes) // PAGE_SIZE))
+        self.page = min(self.page, pages - 1)
+        self.page_var.set(f"第 {self.page + 1}/{pages} 页（共 {len(processes)} 个进程）")
+        start = self.page * PAGE_SIZE
+        return processes[start:start + PAGE_SIZE]
+    
+    def change_page(self, step):
+        """翻页"""
+        self.page = max(0, self.page + step)
+        self.refresh()
+    
     def update_process_list(self):
-        """更新进程列表显示"""
-        # 清空现有项
-        for item in self.process_tree.get_children():
-            self.process_tree.delete(item)
-        
-        # 添加新项
-        for process in self.processes:
-            self.process_tree.insert('', 'end', values=(
+        """更新进程列表显示（只显示当前页）"""
+        # 以 PID 为 iid，只更新有变化的行
+        if self.monitor_mode:
+            self.tree_sync.update((str(process['pid']), (
                 process['pid'],
                 process['state'],
                 process['priority'],
-                process['exec_time'],
-                f"{process['progress']:.1f}%"
-            ))
+                process['cmdline'][:60],
+                f"{process['cpu_percent']:.1f}",
+                f"{process['cpu_time']:.2f}s",
+                f"{process['rss_kb'] / 1024:.1f}MB",
+                process['threads'],
+            )) for process in self.page_rows(self.monitor.processes))
+            return
+        self.tree_sync.update((str(process['pid']), (
+            process['pid'],
+            process['state'],
+            process['priority'],
+            process['exec_time'],
+            f"{process['progress']:.1f}%",
+            f"{process['cpu_time']:.2f}s" if 'cpu_time' in process else '-',
+            f"{process['rss_kb'] / 1024:.1f}MB" if 'rss_kb' in process else '-',
+            '{}/{}'.format(*process['ctxt_switches']) if 'ctxt_switches' in process else '-',
+        )) for process in self.page_rows(self.processes))
 
@@ -0,0 +1,116 @@
+"""离散时间进程模拟器
+
+所有进程共用一个时钟线程：每个节拍（TICK 模拟秒）在一次遍历中推进全部运行中
+进程的进度，而不是为每个进程启动一个循环 sleep 的线程。进程数量只影响每个
+节拍的计算量，不再受线程数限制。节拍之间等待多久由 SimClock 决定，可以加速、
+暂停和单步。
+
+进程用与界面共用的 PCB 字典表示：
+    {'pid', 'state', 'priority', 'exec_time', 'progress', 'step'}
+其中 step 为每个节拍增加的进度百分比，创建时计算一次。
+"""
+import threading
+from sim_clock import SimClock
+
+TICK = 0.1  # 每个节拍的模拟时长（秒）
+
+
+def make_pcb(pid, exec_time, priority):
+    """创建就绪状态的 PCB"""
+    return {
+        'pid': pid,
+        'state': '就绪',
+        'priority': priority,
+        'exec_time': exec_time,
+        'progress': 0,
+        'step': 100 / (exec_time * 10) if exec_time > 0 else 100,
+    }
+
+
+class ProcessSimulator:
+    def __init__(self, on_tick=None, speed=1):
+        self.processes = []
+        self.running = []    # 运行中的 PCB，每个节拍批量推进
+        self.on_tick = on_tick
+        self.clock = SimClock(TICK, speed)
+        self.thread = None
+        self.lock = threading.Lock()
+    
+    def add(self, pcb):
+        """加入一个就绪进程（开始执行后才会推进）"""
+        with self.lock:
+            self.processes.append(pcb)
+    
+    def _dispatch(self):
+        """把就绪进程置为运行，必要时启动时钟线程；返回运行中的进程数"""
+        with self.lock:
+            for pcb in self.processes:
+                if pcb['state'] == '就绪':
+                    pcb['state'] = '运行'
+                    self.running.append(pcb)
+            if self.running and self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+            return len(self.running)
+    
+    def start(self):
+        """开始或继续执行"""
+        count = self._dispatch()
+        self.clock.resume()
+        return count
+    
+    def pause(self):
+        """暂停推进；运行中的进程保持原状态，再次 start 时继续"""
+        self.clock.pause()
+    
+    def step(self, ticks=1):
+        """暂停状态下单步推进"""
+        count = self._dispatch()
+        if count:
+            self.clock.step(ticks)
+        return count
+    
+    def set_speed(self, speed):
+        self.clock.set_speed(speed)
+    
+    def reset(self):
+        """停止时钟、等待时钟线程退出，并把所有进程恢复为就绪"""
+        self.clock.stop()
+        thread = self.thread
+        if thread is not None:
+            thread.join()
+        self.clock.reset()
+        with self.lock:
+            self.running = []
+            for pcb in self.processes:
+                pcb['state'] = '就绪'
+                pcb['progress'] = 0
+    
+    def run(self):
+        """时钟线程：所有进程完成或时钟停止时退出"""
+        while True:
+            with self.lock:
+                if not self.running:
+                    self.thread = None
+                    return
+            ticked = self.clock.wait_tick()
+            with self.lock:
+                if not ticked:
+                    self.thread = None
+                    return
+                self.tick()
+            if self.on_tick is not None:
+                self.on_tick()
+    
+    def tick(self):
+        """推进一个节拍（调用方持有锁）"""
+        still_running = []
+        for pcb in self.running:
+            progress = pcb['progress'] + pcb['step']
+            if progress >= 100:
+                pcb['progress'] = 100
+                pcb['state'] = '完成'
+            else:
+                pcb['progress'] = progress
+                still_running.append(pcb)
+        self.running = still_running
@@ -0,0 +1,221 @@
+"""真实进程模式
+
+“创建进程”会启动真正的子进程（subprocess 运行本文件），执行 CPU 密集或
+I/O 密集的负载。一个轮询线程按固定间隔批量读取所有子进程的
+/proc/<pid>/stat（状态、CPU 时间）和 /proc/<pid>/status（RSS、上下文切换），
+写回与模拟模式相同的 PCB 字典，供进程列表和 ProcessVisualization 使用。
+
+暂停/继续通过向子进程发送 SIGSTOP/SIGCONT 实现。仅支持 Linux。
+"""
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SUPPORTED = os.path.isdir('/proc/self') and hasattr(signal, 'SIGSTOP')
+WORKLOADS = {'CPU密集': 'cpu', 'I/O密集': 'io'}
+POLL_INTERVAL = 0.2
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if SUPPORTED else 100
+
+# /proc 状态码到界面状态的映射
+STATES = {
+    'R': '运行',
+    'S': '阻塞', 'D': '阻塞', 'T': '阻塞', 't': '阻塞', 'I': '阻塞',
+    'Z': '完成', 'X': '完成',
+}
+
+
+def read_stat(pid):
+    """读取 /proc/<pid>/stat，返回 (状态码, CPU 秒数)"""
+    with open(f'/proc/{pid}/stat', 'rb') as f:
+        data = f.read()
+    # 进程名可能包含空格和括号，从最后一个 ')' 之后开始解析
+    fields = data[data.rfind(b')') + 2:].split()
+    return fields[0].decode(), (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def read_status(pid):
+    """读取 /proc/<pid>/status，返回 (RSS KB, 自愿切换, 非自愿切换)"""
+    rss = voluntary = involuntary = 0
+    with open(f'/proc/{pid}/status', 'rb') as f:
+        for line in f:
+            if line.startswith(b'VmRSS:'):
+                rss = int(line.split()[1])
+            elif line.startswith(b'voluntary_ctxt_switches:'):
+                voluntary = int(line.split()[1])
+            elif line.startswith(b'nonvoluntary_ctxt_switches:'):
+                involuntary = int(line.split()[1])
+    return rss, voluntary, involuntary
+
+
+class RealProcessPool:
+    def __init__(self, on_poll=None, interval=POLL_INTERVAL):
+        self.processes = []
+        self.children = {}     # pid -> Popen
+        self.on_poll = on_poll
+        self.interval = interval
+        self.paused = False
+        self.stopped = threading.Event()
+        self.thread = None
+        self.lock = threading.Lock()
+    
+    def spawn(self, exec_time, priority, workload='cpu'):
+        """启动一个子进程并返回其 PCB"""
+        child = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), workload, str(exec_time), str(priority)],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+        pcb = {
+            'pid': child.pid,
+            'state': '运行',
+            'priority': priority,
+            'exec_time': exec_time,
+            'progress': 0,
+            'workload': workload,
+            'started': time.monotonic(),
+            'stopped_at': None,      # 被 SIGSTOP 暂停的时刻
+            'stopped_time': 0.0,     # 累计暂停时长，不计入 I/O 密集进程的进度
+            'cpu_time': 0.0,
+            'rss_kb': 0,
+            'ctxt_switches': (0, 0),
+        }
+        with self.lock:
+            self.children[child.pid] = child
+            self.processes.append(pcb)
+            if self.paused:
+                child.send_signal(signal.SIGSTOP)
+                pcb['stopped_at'] = pcb['started']
+            if self.thread is None:
+                self.stopped.clear()
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+        return pcb
+    
+    def _signal_all(self, sig):
+        with self.lock:
+            for child in self.children.values():
+                if child.returncode is None:
+                    child.send_signal(sig)
+    
+    def pause(self):
+        """向所有子进程发送 SIGSTOP"""
+        self.paused = True
+        self._signal_all(signal.SIGSTOP)
+        now = time.monotonic()
+        with self.lock:
+            for pcb in self.processes:
+                if pcb['stopped_at'] is None:
+                    pcb['stopped_at'] = now
+    
+    def resume(self):
+        """向所有子进程发送 SIGCONT"""
+        self.paused = False
+        self._signal_all(signal.SIGCONT)
+        now = time.monotonic()
+        with self.lock:
+            for pcb in self.processes:
+                if pcb['stopped_at'] is not None:
+                    pcb['stopped_time'] += now - pcb['stopped_at']
+                    pcb['stopped_at'] = None
+    
+    def reset(self):
+        """结束所有子进程、停止轮询并清空列表"""
+        self._signal_all(signal.SIGKILL)
+        self.stopped.set()
+        thread = self.thread
+        if thread is not None:
+            thread.join()
+        with self.lock:
+            for child in self.children.values():
+                child.wait()
+            self.children = {}
+            self.processes = []
+            self.paused = False
+    
+    def run(self):
+        """轮询线程：所有子进程退出或被重置时结束"""
+        while not self.stopped.wait(self.interval):
+            with self.lock:
+                alive = self.poll()
+                if not alive:
+                    self.thread = None
+            if self.on_poll is not None:
+                self.on_poll()
+            if not alive:
+                return
+        with self.lock:
+            self.thread = None
+    
+    def poll(self):
+        """批量刷新所有未结束子进程的状态（调用方持有锁），返回仍在运行的数量"""
+        alive = 0
+        now = time.monotonic()
+        for pcb in self.processes:
+            if pcb['state'] == '完成':
+                continue
+            child = self.children[pcb['pid']]
+            try:
+                code, cpu_time = read_stat(pcb['pid'])
+                rss, voluntary, involuntary = read_status(pcb['pid'])
+            except (OSError, IndexError, ValueError):
+                code = 'X'
+            if code in ('Z', 'X'):
+                # 回收僵尸进程
+                child.wait()
+                pcb['state'] = '完成'
+                pcb['progress'] = 100
+                continue
+            pcb['state'] = STATES.get(code, '阻塞')
+            pcb['cpu_time'] = cpu_time
+            pcb['rss_kb'] = rss
+            pcb['ctxt_switches'] = (voluntary, involuntary)
+            # CPU 密集按实际获得的 CPU 时间计算进度，I/O 密集按扣除暂停后经过的时间
+            if pcb['workload'] == 'cpu':
+                done = cpu_time
+            else:
+                done = (pcb['stopped_at'] or now) - pcb['started'] - pcb['stopped_time']
+            pcb['progress'] = min(99.9, 100 * done / max(pcb['exec_time'], 1e-9))
+            alive += 1
+        return alive
+
+
+def cpu_work(seconds):
+    """占用 seconds 秒 CPU 时间"""
+    end = time.process_time() + seconds
+    x = 0
+    while time.process_time() < end:
+        for i in range(10000):
+            x += i * i
+
+
+def io_work(seconds):
+    """反复写入并同步一个临时文件，累计运行 seconds 秒（被 SIGSTOP 暂停的时间不计）"""
+    resumed = []
+    signal.signal(signal.SIGCONT, lambda signum, frame: resumed.append(True))
+    block = os.urandom(4096)
+    elapsed = 0.0
+    last = time.monotonic()
+    with tempfile.TemporaryFile() as f:
+        while elapsed < seconds:
+            f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+            f.seek(0)
+            time.sleep(0.01)
+            now = time.monotonic()
+            # 收到 SIGCONT 说明这段时间里被暂停过，整段不计
+            if resumed:
+                resumed.clear()
+            else:
+                elapsed += now - last
+            last = now
+
+
+if __name__ == "__main__":
+    workload, seconds, priority = sys.argv[1], float(sys.argv[2]), int(sys.argv[3])
+    if priority > 0:
+        os.nice(priority)
+    (cpu_work if workload == 'cpu' else io_work)(seconds)
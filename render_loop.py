@@ -0,0 +1,67 @@
+"""限帧重绘循环
+
+工作线程不再直接向 Tk 事件队列投递 after(0, ...)，而是调用 mark_dirty
+标记所在选项卡需要重绘；主线程上唯一的 after 循环每秒最多重绘 fps 次，
+并跳过 Notebook 中当前不可见的选项卡（切换过去时再补画）。
+
+设置 perf 为 PerfMonitor 后，开启统计时会上报每次重绘的耗时和帧延迟。
+"""
+import sys
+import time
+
+
+class RenderLoop:
+    def __init__(self, root, notebook=None, fps=20):
+        self.root = root
+        self.notebook = notebook
+        self.interval = max(1, 1000 // fps)
+        self.tabs = {}
+        self.running = False
+        self.perf = None
+    
+    def register(self, frame, redraw):
+        """登记一个选项卡及其重绘函数"""
+        self.tabs[str(frame)] = {'redraw': redraw, 'dirty': True}
+    
+    def mark_dirty(self, frame):
+        """标记选项卡需要重绘（可在任意线程调用）"""
+        self.tabs[str(frame)]['dirty'] = True
+    
+    def start(self):
+        """启动重绘循环"""
+        if not self.running:
+            self.running = True
+            self.root.after(self.interval, self.tick)
+    
+    def stop(self):
+        """停止重绘循环"""
+        self.running = False
+    
+    def tick(self):
+        """重绘所有可见且有变化的选项卡"""
+        if not self.running:
+            return
+        try:
+            self.redraw_dirty()
+        finally:
+            self.root.after(self.interval, self.tick)
+    
+    def redraw_dirty(self):
+        """重绘一帧；单个选项卡重绘出错时报告后继续"""
+        perf = self.perf if self.perf is not None and self.perf.enabled else None
+        if perf is not None:
+            perf.record_tick(self.interval / 1000)
+        visible = self.notebook.select() if self.notebook is not None else None
+        for name, tab in self.tabs.items():
+            if tab['dirty'] and (visible is None or name == visible):
+                # 先清标记再重绘，重绘期间的新变化留到下一帧
+                tab['dirty'] = False
+                start = time.perf_counter()
+                try:
+                    tab['redraw']()
+                except Exception:
+                    # 与 after 回调出错时一样交给 Tk 报告，不影响其他选项卡
+                    self.root.report_callback_exception(*sys.exc_info())
+                    continue
+                if perf is not None:
+                    perf.record_redraw(name, time.perf_counter() - start)
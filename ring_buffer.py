@@ -0,0 +1,138 @@
+"""有界环形缓冲区
+
+固定容量的循环数组，用一把锁和两个 Condition（非空/非满）保护。缓冲区满时
+put 阻塞，空时 get 阻塞，而不是让生产者和消费者 sleep 后轮询。支持任意
+数量的生产者和消费者线程；close() 会唤醒所有等待者，之后的 put 与空缓冲区
+上的 get 抛出 BufferClosed。
+
+put_many/get_many 在一次加锁内传输最多 K 条消息，并一次唤醒相应数量的等待者，
+高频收发时可以大幅减少加锁、唤醒和界面回调的次数。
+"""
+import threading
+import time
+
+
+class BufferClosed(Exception):
+    """缓冲区已关闭"""
+
+
+class RingBuffer:
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("缓冲区容量必须大于 0")
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = 0          # 最早一条消息所在的槽位
+        self.count = 0
+        self.closed = False
+        self.put_count = 0     # 累计写入/读出的消息数
+        self.get_count = 0
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+    
+    def __len__(self):
+        return self.count
+    
+    def put(self, item, timeout=None):
+        """写入一条消息；缓冲区满时最多等待 timeout 秒，超时返回 False"""
+        with self.not_full:
+            if not self.not_full.wait_for(lambda: self.count < self.capacity or self.closed, timeout):
+                return False
+            if self.closed:
+                raise BufferClosed()
+            self.slots[(self.head + self.count) % self.capacity] = item
+            self.count += 1
+            self.put_count += 1
+            self.not_empty.notify()
+            return True
+    
+    def get(self, timeout=None):
+        """取出最早的一条消息；缓冲区空时最多等待 timeout 秒，超时返回 None"""
+        with self.not_empty:
+            if not self.not_empty.wait_for(lambda: self.count or self.closed, timeout):
+                return None
+            if not self.count:
+                raise BufferClosed()
+            item = self.slots[self.head]
+            self.slots[self.head] = None
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+            self.get_count += 1
+            self.not_full.notify()
+            return item
+    
+    def put_many(self, items, timeout=None):
+        """在一次加锁内写入尽可能多的消息（至少一条），返回写入条数；超时返回 0"""
+        with self.not_full:
+            if not self.not_full.wait_for(lambda: self.count < self.capacity or self.closed, timeout):
+                return 0
+            if self.closed:
+                raise BufferClosed()
+            n = min(len(items), self.capacity - self.count)
+            tail = self.head + self.count
+            for i in range(n):
+                self.slots[(tail + i) % self.capacity] = items[i]
+            self.count += n
+            self.put_count += n
+            self.not_empty.notify(n)
+            return n
+    
+    def get_many(self, max_items, timeout=None):
+        """在一次加锁内取出最多 max_items 条消息；缓冲区空时最多等待 timeout 秒，超时返回空列表"""
+        with self.not_empty:
+            if not self.not_empty.wait_for(lambda: self.count or self.closed, timeout):
+                return []
+            if not self.count:
+                raise BufferClosed()
+            n = min(max_items, self.count)
+            items = []
+            for _ in range(n):
+                items.append(self.slots[self.head])
+                self.slots[self.head] = None
+                self.head = (self.head + 1) % self.capacity
+            self.count -= n
+            self.get_count += n
+            self.not_full.notify(n)
+            return items
+    
+    def snapshot(self):
+        """按先后顺序返回当前缓冲区内容的副本"""
+        with self.lock:
+            return [self.slots[(self.head + i) % self.capacity] for i in range(self.count)]
+    
+    def close(self):
+        """关闭缓冲区并唤醒所有等待的线程"""
+        with self.lock:
+            self.closed = True
+            self.not_empty.notify_all()
+            self.not_full.notify_all()
+    
+    def reopen(self):
+        """重新允许读写，保留已有内容"""
+        with self.lock:
+            self.closed = False
+
+
+class RateMeter:
+    """根据累计计数计算每秒速率，至少间隔 window 秒更新一次"""
+    
+    def __init__(self, window=1.0):
+        self.window = window
+        self.last_time = time.monotonic()
+        self.last_count = 0
+        self.rate = 0.0
+    
+    def update(self, count):
+        now = time.monotonic()
+        elapsed = now - self.last_time
+        if elapsed >= self.window:
+            self.rate = (count - self.last_count) / elapsed
+            self.last_time = now
+            self.last_count = count
+        return self.rate
+    
+    def reset(self, count=0):
+        self.last_time = time.monotonic()
+        self.last_count = count
+        self.rate = 0.0
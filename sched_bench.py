@@ -0,0 +1,131 @@
+"""调度算法基准测试
+
+对每个调度算法在 10^3 ~ 10^6 个进程的固定种子负载上计时，并用 tracemalloc
+记录峰值内存，结果以 JSON 输出，便于两次运行之间对比。指定 --baseline 时，
+任何一项耗时超过基线的 --threshold 倍即以非零状态退出。
+
+    python sched_bench.py -o bench.json
+    python sched_bench.py --sizes 1000 10000 --baseline bench.json --threshold 1.5
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from sched_engine import ALGORITHMS, schedule
+import workload
+
+DEFAULT_SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+DEFAULT_SEED = 20240501
+
+
+def bench_workload(size, seed=DEFAULT_SEED):
+    """基准负载：泊松到达、指数分布执行时间，CPU利用率约 80%"""
+    return workload.generate(size, seed=seed, arrival='poisson', burst='exponential',
+                             mean_interarrival=10.0, mean_burst=8.0)
+
+
+def run_one(table, algorithm, repeat=1, measure_memory=True):
+    """运行一个算法，返回最短耗时、峰值内存和片段数"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = schedule(table, algorithm)
+        best = min(best, time.perf_counter() - start)
+    segments = len(result.seg_pid)
+    del result
+
+    peak = None
+    if measure_memory:
+        # 单独运行一次测内存，避免 tracemalloc 的开销计入耗时
+        tracemalloc.start()
+        schedule(table, algorithm)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {'seconds': best, 'peak_bytes': peak, 'segments': segments}
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, algorithms=None, seed=DEFAULT_SEED, repeat=1,
+                   measure_memory=True, log=None):
+    """运行全部基准，返回可写成 JSON 的结果"""
+    results = []
+    for size in sizes:
+        table = bench_workload(size, seed)
+        for algorithm in algorithms or ALGORITHMS:
+            entry = {'algorithm': algorithm, 'size': size}
+            entry.update(run_one(table, algorithm, repeat, measure_memory))
+            results.append(entry)
+            if log:
+                log(entry)
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def find_regressions(report, baseline, threshold=1.5, min_seconds=0.01):
+    """与基线对比，返回耗时超过 threshold 倍的项目
+
+    基线耗时低于 min_seconds 的项目噪声太大，不参与比较。
+    """
+    base = {(r['algorithm'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for entry in report['results']:
+        old = base.get((entry['algorithm'], entry['size']))
+        if old is None or old['seconds'] < min_seconds:
+            continue
+        ratio = entry['seconds'] / old['seconds']
+        if ratio > threshold:
+            regressions.append({'algorithm': entry['algorithm'], 'size': entry['size'],
+                                'baseline': old['seconds'], 'seconds': entry['seconds'],
+                                'ratio': ratio})
+    return regressions
+
+
+def print_entry(entry):
+    peak = entry['peak_bytes']
+    memory = f"{peak / 2 ** 20:9.1f} MiB" if peak is not None else ''
+    print(f"{entry['algorithm']:>20} n={entry['size']:<8} {entry['seconds']:9.3f} s {memory}",
+          file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="调度算法基准测试")
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS))
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--repeat', type=int, default=1, help="每项运行次数，取最短耗时")
+    parser.add_argument('--no-memory', action='store_true', help="不测量峰值内存")
+    parser.add_argument('-o', '--output', help="结果 JSON 文件（默认输出到标准输出）")
+    parser.add_argument('--baseline', help="用于对比的基线 JSON 文件")
+    parser.add_argument('--threshold', type=float, default=1.5, help="允许的最大变慢倍数")
+    parser.add_argument('--min-seconds', type=float, default=0.01,
+                        help="基线耗时低于此值的项目不参与对比")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.algorithms, args.seed, args.repeat,
+                            not args.no_memory, log=print_entry)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.threshold, args.min_seconds)
+        for r in regressions:
+            print(f"性能回退: {r['algorithm']} n={r['size']} {r['baseline']:.3f}s -> "
+                  f"{r['seconds']:.3f}s ({r['ratio']:.2f}x)", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""并行比较多种调度算法
+
+在同一负载上并行运行所有调度算法（RR 按给定的每个时间片各运行一次），
+汇总为一张对比表：平均/尾部等待时间、周转时间、响应时间和上下文切换次数。
+
+负载只在每个工作进程启动时传递一次，各任务只回传汇总后的一行结果。
+
+命令行::
+
+    python sched_compare.py trace.bin --quanta 1 2 4 8 -j 32
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from sched_engine import ALGORITHMS, schedule
+import workload as workload_files
+
+DEFAULT_QUANTA = (1, 2, 4, 8)
+# 使用时间片参数的算法
+QUANTUM_ALGORITHMS = ('RR', 'MLFQ')
+COLUMNS = ('algorithm', 'avg_waiting', 'p99_waiting', 'avg_turnaround', 'p99_turnaround',
+           'avg_response', 'p99_response', 'context_switches', 'makespan')
+
+_workload = None
+
+
+def percentile(sorted_values, q):
+    """已排序序列的百分位数（最近秩法）"""
+    if not sorted_values:
+        return 0
+    rank = max(0, min(len(sorted_values) - 1, int(q / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+def _init_worker(table):
+    global _workload
+    _workload = table
+
+
+def _run_one(algorithm, params):
+    """在工作进程中运行一次调度，返回对比表中的一行"""
+    result = schedule(_workload, algorithm, **params)
+    summary = result.summary()
+    label = algorithm
+    if 'time_quantum' in params:
+        label = f"{algorithm}(q={params['time_quantum']})"
+    row = {'algorithm': label}
+    for metric, values in (('waiting', result.waiting()),
+                           ('turnaround', result.turnaround()),
+                           ('response', result.response())):
+        row[f'avg_{metric}'] = summary[f'avg_{metric}']
+        row[f'p99_{metric}'] = percentile(sorted(values), 99)
+    row['context_switches'] = summary['context_switches']
+    row['makespan'] = summary['makespan']
+    return row
+
+
+def comparison_tasks(algorithms=None, quanta=DEFAULT_QUANTA):
+    """展开为 (算法, 参数) 任务列表"""
+    tasks = []
+    for algorithm in algorithms or ALGORITHMS:
+        if algorithm in QUANTUM_ALGORITHMS:
+            tasks.extend((algorithm, {'time_quantum': q}) for q in quanta)
+        else:
+            tasks.append((algorithm, {}))
+    return tasks
+
+
+def compare(workload, algorithms=None, quanta=DEFAULT_QUANTA, max_workers=None):
+    """在进程池中并行运行所有算法，按任务顺序返回对比表各行"""
+    tasks = comparison_tasks(algorithms, quanta)
+    max_workers = min(len(tasks), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(workload,)) as executor:
+        futures = [executor.submit(_run_one, algorithm, params) for algorithm, params in tasks]
+        return [future.result() for future in futures]
+
+
+def format_table(rows):
+    """把对比表格式化为文本"""
+    lines = ['  '.join(f"{column:>16}" for column in COLUMNS)]
+    for row in rows:
+        cells = []
+        for column in COLUMNS:
+            value = row[column]
+            cells.append(f"{value:>16.2f}" if isinstance(value, float) else f"{value:>16}")
+        lines.append('  '.join(cells))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并行比较调度算法")
+    parser.add_argument('workload', help="负载文件（.csv 或二进制）")
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS))
+    parser.add_argument('--quanta', nargs='+', type=int, default=list(DEFAULT_QUANTA))
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="工作进程数")
+    args = parser.parse_args()
+
+    table = workload_files.load(args.workload)
+    print(format_table(compare(table, args.algorithms, args.quanta, args.jobs)))
+
+
+if __name__ == "__main__":
+    main()
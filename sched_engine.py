@@ -0,0 +1,590 @@
+"""CPU调度引擎（不依赖界面，可在批处理和测试中直接调用）
+
+用法::
+
+    from sched_engine import ProcessTable, schedule
+    table = ProcessTable()
+    table.append(1, 0, 5, priority=2)
+    result = schedule(table, 'RR', time_quantum=2)
+    result.segments   # [{'pid', 'start', 'end'}, ...]，可直接交给 draw_gantt_chart
+    result.summary()  # 平均等待时间、平均周转时间等
+
+进程以列式 ProcessTable 存储（每列一个 array），调度算法只在行号上操作，
+百万级进程时不会为每个进程分配对象。
+"""
+import heapq
+from array import array
+from collections import deque
+from itertools import accumulate
+
+
+class Process:
+    __slots__ = ('pid', 'arrival_time', 'burst_time', 'remaining_time', 'priority',
+                 'start_time', 'finish_time', 'waiting_time', 'turnaround_time')
+
+    def __init__(self, pid, arrival_time, burst_time, priority=1):
+        self.pid = pid
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+        self.remaining_time = burst_time
+        self.priority = priority
+        self.start_time = None
+        self.finish_time = None
+        self.waiting_time = 0
+        self.turnaround_time = 0
+
+
+class ProcessTable:
+    """列式进程表：pid、到达时间、执行时间、优先级各占一个 array('i')"""
+
+    def __init__(self):
+        self.pid = array('i')
+        self.arrival = array('i')
+        self.burst = array('i')
+        self.priority = array('i')
+
+    def __len__(self):
+        return len(self.pid)
+
+    def append(self, pid, arrival, burst, priority=1):
+        """追加一行"""
+        self.pid.append(pid)
+        self.arrival.append(arrival)
+        self.burst.append(burst)
+        self.priority.append(priority)
+
+    def row(self, i):
+        """第 i 行：(pid, 到达时间, 执行时间, 优先级)"""
+        return self.pid[i], self.arrival[i], self.burst[i], self.priority[i]
+
+    def rows(self):
+        """按行遍历"""
+        return zip(self.pid, self.arrival, self.burst, self.priority)
+
+    def copy(self):
+        """复制一份独立的进程表"""
+        table = ProcessTable()
+        for name in ('pid', 'arrival', 'burst', 'priority'):
+            setattr(table, name, array('i', getattr(self, name)))
+        return table
+
+    def clear(self):
+        """清空所有行"""
+        for column in (self.pid, self.arrival, self.burst, self.priority):
+            del column[:]
+
+    def arrival_order(self):
+        """按到达时间排序的行号（同时到达时保持原顺序）"""
+        return sorted(range(len(self)), key=self.arrival.__getitem__)
+
+    @classmethod
+    def from_processes(cls, processes):
+        """由 Process 对象列表构建"""
+        table = cls()
+        for p in processes:
+            table.append(p.pid, p.arrival_time, p.burst_time, p.priority)
+        return table
+
+
+def as_table(workload):
+    """接受 ProcessTable 或 Process 列表"""
+    if isinstance(workload, ProcessTable):
+        return workload
+    return ProcessTable.from_processes(workload)
+
+
+class Schedule:
+    """一次调度的结果：执行片段 + 每个进程的指标
+
+    start、finish 与进程表按行对应；执行片段同样以三列 array 保存。
+    """
+
+    def __init__(self, algorithm, table):
+        self.algorithm = algorithm
+        self.table = table
+        n = len(table)
+        self.start = array('q', [-1]) * n
+        self.finish = array('q', [0]) * n
+        self.seg_pid = array('i')
+        self.seg_start = array('q')
+        self.seg_end = array('q')
+
+    def add_segment(self, pid, start, end):
+        """记录一段执行过程（与上一段同一进程且首尾相接时合并）"""
+        if self.seg_pid and self.seg_pid[-1] == pid and self.seg_end[-1] == start:
+            self.seg_end[-1] = end
+            return
+        self.seg_pid.append(pid)
+        self.seg_start.append(start)
+        self.seg_end.append(end)
+
+    @property
+    def segments(self):
+        """执行片段列表，格式与 draw_gantt_chart 一致"""
+        return [{'pid': pid, 'start': start, 'end': end}
+                for pid, start, end in zip(self.seg_pid, self.seg_start, self.seg_end)]
+
+    def turnaround(self):
+        """每行的周转时间"""
+        return array('q', map(int.__sub__, self.finish, self.table.arrival))
+
+    def waiting(self):
+        """每行的等待时间（周转时间 - 执行时间）"""
+        return array('q', map(int.__sub__, self.turnaround(), self.table.burst))
+
+    def response(self):
+        """每行的响应时间（首次运行 - 到达时间）"""
+        return array('q', map(int.__sub__, self.start, self.table.arrival))
+
+    def context_switches(self):
+        """上下文切换次数：相邻两段属于不同进程即记一次"""
+        return sum(map(int.__ne__, self.seg_pid, self.seg_pid[1:]))
+
+    def metrics(self):
+        """每个进程的指标（按进程表顺序）"""
+        table = self.table
+        return [{
+            'pid': table.pid[i],
+            'arrival': table.arrival[i],
+            'burst': table.burst[i],
+            'start': self.start[i],
+            'finish': self.finish[i],
+            'waiting': self.finish[i] - table.arrival[i] - table.burst[i],
+            'turnaround': self.finish[i] - table.arrival[i],
+            'response': self.start[i] - table.arrival[i],
+        } for i in range(len(table))]
+
+    def summary(self):
+        """汇总指标"""
+        n = len(self.table)
+        if n == 0:
+            return {'count': 0, 'avg_waiting': 0, 'avg_turnaround': 0,
+                    'avg_response': 0, 'makespan': 0, 'context_switches': 0}
+        total_turnaround = sum(self.finish) - sum(self.table.arrival)
+        return {
+            'count': n,
+            'avg_waiting': (total_turnaround - sum(self.table.burst)) / n,
+            'avg_turnaround': total_turnaround / n,
+            'avg_response': (sum(self.start) - sum(self.table.arrival)) / n,
+            'makespan': max(self.finish),
+            'context_switches': self.context_switches(),
+        }
+
+
+def fcfs(workload):
+    """先来先服务调度
+
+    按到达顺序排好后，第 k 个进程的完成时间为
+    C[k] + max(0, max_{j<=k}(arrival[j] - C[j-1]))，C 为执行时间前缀和，
+    因此整个调度只需两次 accumulate。
+    """
+    table = as_table(workload)
+    result = Schedule('FCFS', table)
+    order = table.arrival_order()
+    bursts = [table.burst[i] for i in order]
+    arrivals = [table.arrival[i] for i in order]
+
+    ends = list(accumulate(bursts))
+    slack = accumulate(map(int.__sub__, arrivals, [0] + ends[:-1]), max, initial=0)
+    next(slack)
+    finishes = array('q', map(int.__add__, ends, slack))
+    starts = array('q', map(int.__sub__, finishes, bursts))
+
+    for i, start, finish in zip(order, starts, finishes):
+        result.start[i] = start
+        result.finish[i] = finish
+    # 每个进程恰好一段，直接按列写入
+    result.seg_pid = array('i', (table.pid[i] for i in order))
+    result.seg_start = starts
+    result.seg_end = finishes
+    return result
+
+
+def _run_to_completion(workload, name, keys):
+    """非抢占式事件驱动调度：就绪队列为按 keys(table)[行号] 排序的小顶堆"""
+    table = as_table(workload)
+    result = Schedule(name, table)
+    arrival, burst, pid = table.arrival, table.burst, table.pid
+    order = table.arrival_order()
+    keys = keys(table)
+    ready_queue = []
+    current_time = 0
+    index = 0
+    n = len(order)
+
+    while index < n or ready_queue:
+        # CPU空闲时直接跳到下一个到达时刻
+        if not ready_queue and current_time < arrival[order[index]]:
+            current_time = arrival[order[index]]
+
+        # 把已到达的进程加入就绪队列（序号保证同键时先到先服务）
+        while index < n and arrival[order[index]] <= current_time:
+            i = order[index]
+            heapq.heappush(ready_queue, (keys[i], index, i))
+            index += 1
+
+        _, _, i = heapq.heappop(ready_queue)
+        result.start[i] = current_time
+
+        # 执行进程直到完成
+        start_time = current_time
+        current_time += burst[i]
+        result.finish[i] = current_time
+        result.add_segment(pid[i], start_time, current_time)
+
+    return result
+
+
+def _run_preemptive(workload, name, keys):
+    """抢占式事件驱动调度：只在进程到达时检查是否需要抢占
+
+    keys(table, remaining) 返回按行号索引的排序键；SRTF 直接使用 remaining。
+    """
+    table = as_table(workload)
+    result = Schedule(name, table)
+    arrival, pid = table.arrival, table.pid
+    order = table.arrival_order()
+    remaining = array('q', table.burst)
+    keys = keys(table, remaining)
+    ready_queue = []
+    current_time = 0
+    index = 0
+    n = len(order)
+    running = None
+    running_seq = 0
+    segment_start = 0
+
+    while index < n or ready_queue or running is not None:
+        if running is None:
+            # CPU空闲时直接跳到下一个到达时刻
+            if not ready_queue and current_time < arrival[order[index]]:
+                current_time = arrival[order[index]]
+            while index < n and arrival[order[index]] <= current_time:
+                i = order[index]
+                heapq.heappush(ready_queue, (keys[i], index, i))
+                index += 1
+
+            _, running_seq, running = heapq.heappop(ready_queue)
+            if result.start[running] < 0:
+                result.start[running] = current_time
+            segment_start = current_time
+
+        finish_time = current_time + remaining[running]
+
+        if index < n and arrival[order[index]] < finish_time:
+            # 运行到下一个到达事件
+            arrival_time = arrival[order[index]]
+            remaining[running] -= arrival_time - current_time
+            current_time = arrival_time
+            while index < n and arrival[order[index]] <= current_time:
+                i = order[index]
+                heapq.heappush(ready_queue, (keys[i], index, i))
+                index += 1
+
+            # 新到达的进程更优时抢占当前进程
+            if ready_queue[0][0] < keys[running]:
+                result.add_segment(pid[running], segment_start, current_time)
+                heapq.heappush(ready_queue, (keys[running], running_seq, running))
+                running = None
+        else:
+            # 运行到完成
+            current_time = finish_time
+            remaining[running] = 0
+            result.add_segment(pid[running], segment_start, current_time)
+            result.finish[running] = current_time
+            running = None
+
+    return result
+
+
+def sjf(workload):
+    """最短作业优先调度"""
+    return _run_to_completion(workload, 'SJF', lambda table: table.burst)
+
+
+def rr(workload, time_quantum=2):
+    """时间片轮转调度"""
+    if time_quantum < 1:
+        raise ValueError(f"时间片必须为正整数: {time_quantum}")
+    table = as_table(workload)
+    result = Schedule('RR', table)
+    arrival, pid = table.arrival, table.pid
+    order = table.arrival_order()
+    remaining = array('q', table.burst)
+    current_time = 0
+    ready_queue = deque()
+    index = 0
+    n = len(order)
+
+    while index < n or ready_queue:
+        # CPU空闲时直接跳到下一个到达时刻
+        if not ready_queue and current_time < arrival[order[index]]:
+            current_time = arrival[order[index]]
+
+        # 添加到达的进程
+        while index < n and arrival[order[index]] <= current_time:
+            ready_queue.append(order[index])
+            index += 1
+
+        i = ready_queue.popleft()
+
+        if result.start[i] < 0:
+            result.start[i] = current_time
+
+        # 执行时间片；队列中只有它一个时，连续执行到下一个进程到达后的时间片边界
+        execution_time = min(time_quantum, remaining[i])
+        if not ready_queue:
+            if index < n:
+                slices = max(1, -(-(arrival[order[index]] - current_time) // time_quantum))
+                execution_time = min(slices * time_quantum, remaining[i])
+            else:
+                execution_time = remaining[i]
+        start_time = current_time
+        current_time += execution_time
+        remaining[i] -= execution_time
+
+        result.add_segment(pid[i], start_time, current_time)
+
+        # 添加新到达的进程
+        while index < n and arrival[order[index]] <= current_time:
+            ready_queue.append(order[index])
+            index += 1
+
+        # 如果进程未完成，重新加入队列
+        if remaining[i] > 0:
+            ready_queue.append(i)
+        else:
+            result.finish[i] = current_time
+
+    return result
+
+
+def priority(workload):
+    """优先级调度（数字越小优先级越高）"""
+    return _run_to_completion(workload, 'Priority', lambda table: table.priority)
+
+
+def srtf(workload):
+    """最短剩余时间优先调度（抢占式SJF）"""
+    return _run_preemptive(workload, 'SRTF', lambda table, remaining: remaining)
+
+
+def preemptive_priority(workload):
+    """抢占式优先级调度（数字越小优先级越高）"""
+    return _run_preemptive(workload, 'PreemptivePriority',
+                           lambda table, remaining: table.priority)
+
+
+class _ChunkedQueue:
+    """由若干 deque 首尾串接的先进先出队列，整条队列并入另一条为 O(1)"""
+    __slots__ = ('chunks', 'size')
+
+    def __init__(self):
+        self.chunks = deque([deque()])
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, item):
+        self.chunks[-1].append(item)
+        self.size += 1
+
+    def popleft(self):
+        while not self.chunks[0]:
+            self.chunks.popleft()
+        self.size -= 1
+        return self.chunks[0].popleft()
+
+    def absorb(self, other):
+        """把 other 整体接到队尾，other 变为空队列"""
+        self.chunks.extend(other.chunks)
+        self.size += other.size
+        other.chunks = deque([deque()])
+        other.size = 0
+
+
+def mlfq(workload, levels=3, time_quantum=2, quanta=None, boost_interval=50):
+    """多级反馈队列调度
+
+    新进程进入第 0 级；用完本级时间片仍未完成则降一级。第 k 级时间片默认为
+    time_quantum * 2**k，也可用 quanta 逐级指定（此时级数为 len(quanta)）。
+    每隔 boost_interval 个时间单位把所有进程提升回第 0 级，防止饥饿。
+    新到达的进程在时间片结束时参与选择。
+    """
+    if quanta is None:
+        quanta = [time_quantum * 2 ** level for level in range(levels)]
+    if not quanta or min(quanta) < 1:
+        raise ValueError(f"时间片必须为正整数: {list(quanta)}")
+    levels = len(quanta)
+    table = as_table(workload)
+    result = Schedule('MLFQ', table)
+    arrival, pid = table.arrival, table.pid
+    order = table.arrival_order()
+    remaining = array('q', table.burst)
+    queues = [_ChunkedQueue() for _ in range(levels)]
+    queued = 0
+    current_time = 0
+    next_boost = boost_interval
+    index = 0
+    n = len(order)
+
+    while index < n or queued:
+        # 周期性提升：低级队列整体接到第 0 级队尾
+        if boost_interval and current_time >= next_boost:
+            for level in range(1, levels):
+                queues[0].absorb(queues[level])
+            next_boost += ((current_time - next_boost) // boost_interval + 1) * boost_interval
+
+        # CPU空闲时直接跳到下一个到达时刻
+        if not queued and current_time < arrival[order[index]]:
+            current_time = arrival[order[index]]
+
+        while index < n and arrival[order[index]] <= current_time:
+            queues[0].append(order[index])
+            queued += 1
+            index += 1
+
+        # 选择最高非空级别的队首进程
+        level = 0
+        while not queues[level]:
+            level += 1
+        i = queues[level].popleft()
+        queued -= 1
+
+        if result.start[i] < 0:
+            result.start[i] = current_time
+
+        execution_time = min(quanta[level], remaining[i])
+        start_time = current_time
+        current_time += execution_time
+        remaining[i] -= execution_time
+        result.add_segment(pid[i], start_time, current_time)
+
+        while index < n and arrival[order[index]] <= current_time:
+            queues[0].append(order[index])
+            queued += 1
+            index += 1
+
+        if remaining[i] > 0:
+            # 用完时间片，降一级
+            queues[min(level + 1, levels - 1)].append(i)
+            queued += 1
+        else:
+            result.finish[i] = current_time
+
+    return result
+
+
+NICE_0_WEIGHT = 1024
+# Linux sched_prio_to_weight：nice -20 … 19 的权重，相邻两级约相差 1.25 倍
+PRIO_TO_WEIGHT = (
+    88761, 71755, 56483, 46273, 36291,
+    29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906,
+    3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423,
+    335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45,
+    36, 29, 23, 18, 15,
+)
+
+
+def nice_weight(priority):
+    """优先级 1 对应 nice 0，超出 nice -20 … 19 的优先级按边界处理"""
+    return PRIO_TO_WEIGHT[min(39, max(0, priority + 19))]
+
+
+def cfs(workload, target_latency=12, min_granularity=1):
+    """CFS式完全公平调度
+
+    每次选择虚拟运行时间最小的进程（小顶堆）。优先级 p 按 nice = p - 1 查 Linux 的
+    权重表（nice 每大 1 权重约除以 1.25，超出 -20 … 19 时取边界）；
+    虚拟运行时间按 实际运行时间 * 1024 / 权重 增长。时间片为 target_latency 按
+    权重比例分给就绪进程，不小于 min_granularity。新进程以当前最小虚拟运行时间
+    加入，避免长期占用CPU。
+    """
+    table = as_table(workload)
+    result = Schedule('CFS', table)
+    arrival, pid = table.arrival, table.pid
+    order = table.arrival_order()
+    remaining = array('q', table.burst)
+    weight = array('d', map(nice_weight, table.priority))
+    ready_queue = []   # (vruntime, 序号, 行号)
+    total_weight = 0.0
+    min_vruntime = 0.0
+    current_time = 0
+    index = 0
+    seq = 0
+    n = len(order)
+
+    while index < n or ready_queue:
+        # CPU空闲时直接跳到下一个到达时刻
+        if not ready_queue and current_time < arrival[order[index]]:
+            current_time = arrival[order[index]]
+
+        while index < n and arrival[order[index]] <= current_time:
+            i = order[index]
+            heapq.heappush(ready_queue, (min_vruntime, seq, i))
+            total_weight += weight[i]
+            seq += 1
+            index += 1
+
+        vruntime, _, i = heapq.heappop(ready_queue)
+        if result.start[i] < 0:
+            result.start[i] = current_time
+
+        if ready_queue:
+            time_slice = max(min_granularity, int(target_latency * weight[i] / total_weight))
+            execution_time = min(time_slice, remaining[i])
+        elif index < n:
+            # 只有它一个就绪进程：运行到下一个进程到达
+            execution_time = min(remaining[i], arrival[order[index]] - current_time)
+        else:
+            execution_time = remaining[i]
+
+        start_time = current_time
+        current_time += execution_time
+        remaining[i] -= execution_time
+        vruntime += execution_time * NICE_0_WEIGHT / weight[i]
+        result.add_segment(pid[i], start_time, current_time)
+
+        min_vruntime = max(min_vruntime, min(vruntime, ready_queue[0][0]) if ready_queue else vruntime)
+
+        # 先加入新到达的进程，再让当前进程回到队列
+        while index < n and arrival[order[index]] <= current_time:
+            j = order[index]
+            heapq.heappush(ready_queue, (min_vruntime, seq, j))
+            total_weight += weight[j]
+            seq += 1
+            index += 1
+
+        if remaining[i] > 0:
+            heapq.heappush(ready_queue, (vruntime, seq, i))
+            seq += 1
+        else:
+            total_weight -= weight[i]
+            result.finish[i] = current_time
+
+    return result
+
+
+ALGORITHMS = {
+    'FCFS': fcfs,
+    'SJF': sjf,
+    'RR': rr,
+    'Priority': priority,
+    'SRTF': srtf,
+    'PreemptivePriority': preemptive_priority,
+    'MLFQ': mlfq,
+    'CFS': cfs,
+}
+
+
+def schedule(workload, algorithm, **params):
+    """按名称运行调度算法，返回 Schedule"""
+    try:
+        scheduler = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"未知的调度算法: {algorithm}")
+    return scheduler(workload, **params)
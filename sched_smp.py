@@ -0,0 +1,206 @@
+"""多核（SMP）调度模拟：每个CPU一个就绪队列，支持工作窃取和周期性负载均衡
+
+用法::
+
+    from sched_smp import schedule_smp
+    result = schedule_smp(table, 'SJF', cpus=8, balance='steal')
+    result.segments   # [{'pid', 'start', 'end', 'cpu'}, ...]
+    result.summary()  # 在单核指标基础上增加各核利用率和迁移次数
+
+balance 取值：
+    'none'  新到达的进程优先放到空闲CPU，否则轮流分配，之后不再迁移
+    'steal' 空闲CPU从最长的队列中窃取一个进程
+    'push'  每隔 balance_interval 个时间单位，把最长队列的进程推给最短队列
+"""
+import heapq
+from array import array
+from collections import deque
+from itertools import count
+from sched_engine import Schedule, as_table
+
+POLICIES = ('FCFS', 'SJF', 'RR', 'Priority')
+BALANCE_MODES = ('none', 'steal', 'push')
+
+
+class SMPSchedule(Schedule):
+    """多核调度结果：执行片段多一列 cpu，另记录各核忙碌时间和迁移次数"""
+
+    def __init__(self, algorithm, table, cpus):
+        super().__init__(algorithm, table)
+        self.cpus = cpus
+        self.seg_cpu = array('i')
+        self.busy = array('q', [0]) * cpus
+        self.migrations = 0
+        self._last_segment = [-1] * cpus
+
+    def add_segment(self, pid, start, end, cpu=0):
+        """记录一段执行过程（同一CPU上同一进程首尾相接时合并）"""
+        self.busy[cpu] += end - start
+        last = self._last_segment[cpu]
+        if last >= 0 and self.seg_pid[last] == pid and self.seg_end[last] == start:
+            self.seg_end[last] = end
+            return
+        self._last_segment[cpu] = len(self.seg_pid)
+        self.seg_pid.append(pid)
+        self.seg_start.append(start)
+        self.seg_end.append(end)
+        self.seg_cpu.append(cpu)
+
+    @property
+    def segments(self):
+        """执行片段列表，比单核多一个 'cpu' 字段"""
+        return [{'pid': pid, 'start': start, 'end': end, 'cpu': cpu}
+                for pid, start, end, cpu in zip(self.seg_pid, self.seg_start,
+                                                self.seg_end, self.seg_cpu)]
+
+    def context_switches(self):
+        """上下文切换次数（各CPU分别统计后求和）"""
+        last_pid = [None] * self.cpus
+        switches = 0
+        for pid, cpu in zip(self.seg_pid, self.seg_cpu):
+            if last_pid[cpu] is not None and last_pid[cpu] != pid:
+                switches += 1
+            last_pid[cpu] = pid
+        return switches
+
+    def utilization(self):
+        """各核利用率（忙碌时间 / 总完成时间）"""
+        makespan = max(self.finish) if len(self.finish) else 0
+        return [busy / makespan if makespan else 0.0 for busy in self.busy]
+
+    def summary(self):
+        """汇总指标"""
+        summary = super().summary()
+        summary['cpus'] = self.cpus
+        summary['migrations'] = self.migrations
+        summary['utilization'] = self.utilization()
+        return summary
+
+
+def schedule_smp(workload, algorithm='FCFS', cpus=4, balance='steal',
+                 time_quantum=2, balance_interval=10):
+    """在 cpus 个核上运行调度算法，返回 SMPSchedule"""
+    if algorithm not in POLICIES:
+        raise ValueError(f"多核模式不支持的调度算法: {algorithm}")
+    if balance not in BALANCE_MODES:
+        raise ValueError(f"未知的负载均衡方式: {balance}")
+    if algorithm == 'RR' and time_quantum < 1:
+        raise ValueError(f"时间片必须为正整数: {time_quantum}")
+
+    table = as_table(workload)
+    result = SMPSchedule(algorithm, table, cpus)
+    arrival, pid = table.arrival, table.pid
+    order = table.arrival_order()
+    remaining = array('q', table.burst)
+    n = len(order)
+
+    # FCFS/RR 使用先进先出队列，SJF/Priority 使用按键排序的小顶堆
+    keys = {'SJF': table.burst, 'Priority': table.priority}.get(algorithm)
+    quantum = time_quantum if algorithm == 'RR' else None
+    queues = [deque() if keys is None else [] for _ in range(cpus)]
+    sequence = count()   # 同键时先入队者优先
+
+    running = [-1] * cpus
+    segment_start = [0] * cpus
+    idle = set(range(cpus))
+    events = []   # (结束时间, cpu)：正在运行的时间片
+    queued = 0
+    next_cpu = 0
+    next_balance = balance_interval
+    index = 0
+    inf = float('inf')
+
+    def enqueue(cpu, i):
+        if keys is None:
+            queues[cpu].append(i)
+        else:
+            heapq.heappush(queues[cpu], (keys[i], next(sequence), i))
+
+    def dequeue(cpu, newest=False):
+        if keys is None:
+            return queues[cpu].pop() if newest else queues[cpu].popleft()
+        return heapq.heappop(queues[cpu])[2]
+
+    def longest_queue():
+        return max(range(cpus), key=lambda c: len(queues[c]))
+
+    def start(cpu, now):
+        nonlocal queued
+        i = dequeue(cpu)
+        queued -= 1
+        idle.discard(cpu)
+        running[cpu] = i
+        segment_start[cpu] = now
+        if result.start[i] < 0:
+            result.start[i] = now
+        run = remaining[i] if quantum is None else min(quantum, remaining[i])
+        heapq.heappush(events, (now + run, cpu))
+
+    while index < n or queued or events:
+        current_time = min(events[0][0] if events else inf,
+                           arrival[order[index]] if index < n else inf)
+        if balance == 'push':
+            if queued and next_balance < current_time:
+                current_time = next_balance
+            elif next_balance < current_time:
+                # 没有排队的进程时跳过中间的均衡点，下一次落在当前时刻或之后
+                next_balance += -(-(current_time - next_balance) // balance_interval) * balance_interval
+
+        # 1. 时间片结束或进程完成
+        preempted = []
+        while events and events[0][0] == current_time:
+            _, cpu = heapq.heappop(events)
+            i = running[cpu]
+            remaining[i] -= current_time - segment_start[cpu]
+            result.add_segment(pid[i], segment_start[cpu], current_time, cpu)
+            running[cpu] = -1
+            idle.add(cpu)
+            if remaining[i] > 0:
+                preempted.append((cpu, i))
+            else:
+                result.finish[i] = current_time
+
+        # 2. 新到达的进程：优先放到空闲且队列为空的CPU，否则轮流分配
+        if index < n and arrival[order[index]] <= current_time:
+            free = sorted((c for c in idle if not queues[c]), reverse=True)
+            while index < n and arrival[order[index]] <= current_time:
+                if free:
+                    cpu = free.pop()
+                else:
+                    cpu = next_cpu
+                    next_cpu = (next_cpu + 1) % cpus
+                enqueue(cpu, order[index])
+                queued += 1
+                index += 1
+
+        # 3. 被抢占的进程回到自己CPU的队尾（排在同时到达的进程之后）
+        for cpu, i in preempted:
+            enqueue(cpu, i)
+            queued += 1
+
+        # 4. 周期性负载均衡：最长队列推给最短队列，直到相差不超过1
+        if balance == 'push' and current_time == next_balance:
+            next_balance += balance_interval
+            while queued:
+                source = longest_queue()
+                target = min(range(cpus), key=lambda c: len(queues[c]))
+                if len(queues[source]) - len(queues[target]) <= 1:
+                    break
+                enqueue(target, dequeue(source, newest=True))
+                result.migrations += 1
+
+        # 5. 空闲CPU先运行自己队列中的进程；仍然空闲的CPU在 steal 模式下
+        #    从最长队列窃取（此时有进程排队的CPU都在运行，不会抢走它马上要运行的进程）
+        if queued:
+            for cpu in sorted(idle):
+                if queues[cpu]:
+                    start(cpu, current_time)
+            if balance == 'steal':
+                for cpu in sorted(idle):
+                    if not queued:
+                        break
+                    enqueue(cpu, dequeue(longest_queue(), newest=True))
+                    result.migrations += 1
+                    start(cpu, current_time)
+
+    return result
@@ -1,33 +1,42 @@
 import tkinter as tk
-from tkinter import ttk
-import heapq
-import time
+from tkinter import ttk, messagebox, filedialog
+import threading
+from sched_engine import ProcessTable, schedule
+from sched_smp import schedule_smp, BALANCE_MODES
+import workload
+from tree_sync import TreeSync
+from sched_compare import compare, COLUMNS as COMPARE_COLUMNS
 from visualization import SchedulerVisualization
+from gantt_export import export_svg
 
-class Process:
-    def __init__(self, pid, arrival_time, burst_time, priority=1):
-        self.pid = pid
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.remaining_time = burst_time
-        self.priority = priority
-        self.start_time = None
-        self.finish_time = None
-        self.waiting_time = 0
-        self.turnaround_time = 0
+# 进程列表分页显示，每页行数
+PAGE_SIZE = 500
+
+COMPARE_HEADINGS = {
+    'algorithm': '算法',
+    'avg_waiting': '平均等待',
+    'p99_waiting': 'P99等待',
+    'avg_turnaround': '平均周转',
+    'p99_turnaround': 'P99周转',
+    'avg_response': '平均响应',
+    'p99_response': 'P99响应',
+    'context_switches': '上下文切换',
+    'makespan': '总完成时间',
+}
 
 class SchedulerDemo:
     def __init__(self, parent, status_var):
         self.parent = parent
         self.status_var = status_var
-        self.processes = []
-        self.scheduled_processes = []
+        self.processes = ProcessTable()
+        self.schedule = None
+        self.page = 0
         self.next_pid = 1
         self.current_time = 0
         self.is_running = False
         
         self.setup_ui()
-        self.visualization = SchedulerVisualization(self.canvas)
+        self.visualization = SchedulerVisualization(self.canvas, self.gantt_scrollbar)
     
     def setup_ui(self):
         """设置调度器界面"""
@@ -37,6 +46,10 @@ class SchedulerDemo:
         
         ttk.Button(control_frame, text="添加进程", 
                   command=self.add_process).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="加载负载", 
+                  command=self.load_workload).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="随机负载", 
+                  command=self.generate_workload).pack(side='left', padx=5)
         ttk.Button(control_frame, text="FCFS调度", 
                   command=lambda: self.run_scheduler('FCFS')).pack(side='left', padx=5)
         ttk.Button(control_frame, text="SJF调度", 
@@ -45,6 +58,18 @@ class SchedulerDemo:
                   command=lambda: self.run_scheduler('RR')).pack(side='left', padx=5)
         ttk.Button(control_frame, text="优先级调度", 
                   command=lambda: self.run_scheduler('Priority')).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="SRTF调度", 
+                  command=lambda: self.run_scheduler('SRTF')).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="抢占式优先级", 
+                  command=lambda: self.run_scheduler('PreemptivePriority')).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="MLFQ调度", 
+                  command=lambda: self.run_scheduler('MLFQ')).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="CFS调度", 
+                  command=lambda: self.run_scheduler('CFS')).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="全部比较", 
+                  command=self.compare_all).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="导出SVG", 
+                  command=self.export_gantt).pack(side='left', padx=5)
         ttk.Button(control_frame, text="重置", 
                   command=self.reset).pack(side='left', padx=5)
         
@@ -73,6 +98,45 @@ class SchedulerDemo:
         self.time_quantum.insert(0, "2")
         self.time_quantum.grid(row=0, column=7, padx=5)
         
+        # 多核设置：CPU数大于1时使用多核调度
+        ttk.Label(param_frame, text="CPU数:").grid(row=0, column=8, padx=5)
+        self.cpu_count = ttk.Entry(param_frame, width=8)
+        self.cpu_count.insert(0, "1")
+        self.cpu_count.grid(row=0, column=9, padx=5)
+        
+        ttk.Label(param_frame, text="负载均衡:").grid(row=0, column=10, padx=5)
+        self.balance = ttk.Combobox(param_frame, values=BALANCE_MODES, width=8, state='readonly')
+        self.balance.set('steal')
+        self.balance.grid(row=0, column=11, padx=5)
+        
+        # 随机负载设置
+        ttk.Label(param_frame, text="进程数:").grid(row=1, column=0, padx=5)
+        self.workload_size = ttk.Entry(param_frame, width=8)
+        self.workload_size.insert(0, "1000")
+        self.workload_size.grid(row=1, column=1, padx=5)
+        
+        ttk.Label(param_frame, text="执行时间分布:").grid(row=1, column=2, padx=5)
+        self.burst_distribution = ttk.Combobox(param_frame, values=workload.BURST_DISTRIBUTIONS,
+                                               width=10, state='readonly')
+        self.burst_distribution.set('exponential')
+        self.burst_distribution.grid(row=1, column=3, padx=5)
+        
+        ttk.Label(param_frame, text="到达模式:").grid(row=1, column=4, padx=5)
+        self.arrival_pattern = ttk.Combobox(param_frame, values=workload.ARRIVAL_PATTERNS,
+                                            width=10, state='readonly')
+        self.arrival_pattern.set('poisson')
+        self.arrival_pattern.grid(row=1, column=5, padx=5)
+        
+        ttk.Label(param_frame, text="随机种子:").grid(row=1, column=6, padx=5)
+        self.seed = ttk.Entry(param_frame, width=8)
+        self.seed.insert(0, "0")
+        self.seed.grid(row=1, column=7, padx=5)
+        
+        ttk.Label(param_frame, text="比较时间片:").grid(row=1, column=8, padx=5)
+        self.compare_quanta = ttk.Entry(param_frame, width=12)
+        self.compare_quanta.insert(0, "1,2,4,8")
+        self.compare_quanta.grid(row=1, column=9, columnspan=3, sticky='w', padx=5)
+        
         # 进程列表
         list_frame = ttk.LabelFrame(self.parent, text="进程列表")
         list_frame.pack(fill='both', expand=True, padx=5, pady=5)
@@ -84,12 +148,26 @@ class SchedulerDemo:
             self.process_tree.heading(col, text=col)
             self.process_tree.column(col, width=100)
         
+        # 分页：大负载只在 Treeview 中保留当前页的行
+        page_frame = ttk.Frame(list_frame)
+        page_frame.pack(side='bottom', fill='x')
+        ttk.Button(page_frame, text="上一页", 
+                  command=lambda: self.change_page(-1)).pack(side='left', padx=5)
+        ttk.Button(page_frame, text="下一页", 
+                  command=lambda: self.change_page(1)).pack(side='left', padx=5)
+        self.page_var = tk.StringVar(value="第 1/1 页")
+        ttk.Label(page_frame, textvariable=self.page_var).pack(side='left', padx=10)
+        
         self.process_tree.pack(fill='both', expand=True)
+        self.tree_sync = TreeSync(self.process_tree)
         
         # 可视化画布
         canvas_frame = ttk.LabelFrame(self.parent, text="调度过程可视化")
         canvas_frame.pack(fill='both', expand=True, padx=5, pady=5)
         
+        # 滚轮缩放、拖动或滚动条平移、双击显示全图
+        self.gantt_scrollbar = ttk.Scrollbar(canvas_frame, orient='horizontal')
+        self.gantt_scrollbar.pack(side='bottom', fill='x')
         self.canvas = tk.Canvas(canvas_frame, bg='white', height=200)
         self.canvas.pack(fill='both', expand=True)
         
@@ -110,245 +188,200 @@ class SchedulerDemo:
             burst = int(self.burst_time.get())
             priority = int(self.priority.get())
             
-            process = Process(self.next_pid, arrival, burst, priority)
-            self.processes.append(process)
+            pid = self.next_pid
+            self.processes.append(pid, arrival, burst, priority)
             self.next_pid += 1
             
+            # 之前的调度结果不包含新进程，清除后重新运行
+            self.clear_schedule()
             self.update_process_list()
-            self.status_var.set(f"添加进程 PID: {process.pid}")
+            self.status_var.set(f"添加进程 PID: {pid}")
             
         except ValueError:
             messagebox.showerror("错误", "请输入有效的数字")
     
+    def load_workload(self):
+        """从 CSV 或二进制文件加载负载"""
+        path = filedialog.askopenfilename(filetypes=[("负载文件", "*.csv *.bin"), ("所有文件", "*.*")])
+        if not path:
+            return
+        try:
+            table = workload.load(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("错误", f"加载失败: {e}")
+            return
+        self.set_workload(table)
+        self.status_var.set(f"已加载 {len(table)} 个进程: {path}")
+    
+    def export_gantt(self):
+        """把当前甘特图视图导出为 SVG"""
+        if self.schedule is None or self.visualization.index is None:
+            messagebox.showwarning("警告", "请先运行调度算法")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".svg", filetypes=[("SVG", "*.svg")])
+        if not path:
+            return
+        t0, t1 = self.visualization.view
+        try:
+            export_svg(self.visualization.index, path, t0=t0, t1=t1)
+        except OSError as e:
+            messagebox.showerror("错误", f"导出失败: {e}")
+            return
+        self.status_var.set(f"甘特图已导出: {path}")
+    
+    def generate_workload(self):
+        """生成随机负载"""
+        try:
+            n = int(self.workload_size.get())
+            seed = int(self.seed.get())
+        except ValueError:
+            messagebox.showerror("错误", "请输入有效的数字")
+            return
+        try:
+            table = workload.generate(n, seed=seed, arrival=self.arrival_pattern.get(),
+                                      burst=self.burst_distribution.get())
+        except ValueError as e:
+            messagebox.showerror("错误", str(e))
+            return
+        self.set_workload(table)
+        self.status_var.set(f"已生成 {n} 个进程（种子 {seed}）")
+    
+    def set_workload(self, table):
+        """替换当前负载"""
+        self.processes = table
+        self.clear_schedule()
+        self.page = 0
+        self.next_pid = max(table.pid) + 1 if len(table) else 1
+        self.update_process_list()
+    
+    def clear_schedule(self):
+        """清除调度结果、甘特图和性能指标"""
+        self.schedule = None
+        self.visualization.clear()
+        self.avg_wait_var.set("平均等待时间: --")
+        self.avg_turnaround_var.set("平均周转时间: --")
+    
     def run_scheduler(self, algorithm):
         """运行调度算法"""
         if not self.processes:
             messagebox.showwarning("警告", "没有可调度的进程")
             return
         
-        self.is_running = True
-        self.scheduled_processes = []
-        
-        if algorithm == 'FCFS':
-            self.fcfs_scheduler()
-        elif algorithm == 'SJF':
-            self.sjf_scheduler()
-        elif algorithm == 'RR':
-            self.rr_scheduler()
-        elif algorithm == 'Priority':
-            self.priority_scheduler()
+        params = {}
+        if algorithm in ('RR', 'MLFQ'):
+            try:
+                params['time_quantum'] = int(self.time_quantum.get())
+            except ValueError:
+                params['time_quantum'] = 2
         
-        self.calculate_metrics()
-        self.status_var.set(f"完成 {algorithm} 调度")
-    
-    def fcfs_scheduler(self):
-        """先来先服务调度"""
-        # 按到达时间排序
-        ready_queue = sorted(self.processes, key=lambda p: p.arrival_time)
-        current_time = 0
-        
-        for process in ready_queue:
-            if current_time < process.arrival_time:
-                current_time = process.arrival_time
-            
-            process.start_time = current_time
-            process.finish_time = current_time + process.burst_time
-            process.waiting_time = current_time - process.arrival_time
-            process.turnaround_time = process.finish_time - process.arrival_time
-            
-            # 记录调度过程
-            self.scheduled_processes.append({
-                'pid': process.pid,
-                'start': current_time,
-                'end': process.finish_time
-            })
-            
-            current_time = process.finish_time
+        try:
+            cpus = max(1, int(self.cpu_count.get()))
+        except ValueError:
+            cpus = 1
         
-        self.visualization.draw_gantt_chart(self.scheduled_processes)
-    
-    def sjf_scheduler(self):
-        """最短作业优先调度"""
-        current_time = 0
-        completed = 0
-        n = len(self.processes)
-        
-        # 复制进程列表
-        processes = [Process(p.pid, p.arrival_time, p.burst_time) for p in self.processes]
-        
-        while completed < n:
-            # 找出已到达且剩余时间最短的进程
-            available = [p for p in processes if p.arrival_time <= current_time and p.remaining_time > 0]
-            
-            if not available:
-                current_time += 1
-                continue
-            
-            # 选择剩余时间最短的进程
-            shortest = min(available, key=lambda p: p.remaining_time)
-            
-            if shortest.start_time is None:
-                shortest.start_time = current_time
-            
-            # 执行进程
-            execution_time = shortest.remaining_time
-            shortest.remaining_time = 0
-            current_time += execution_time
-            
-            shortest.finish_time = current_time
-            shortest.waiting_time = shortest.start_time - shortest.arrival_time
-            shortest.turnaround_time = shortest.finish_time - shortest.arrival_time
-            
-            # 记录调度过程
-            self.scheduled_processes.append({
-                'pid': shortest.pid,
-                'start': shortest.start_time,
-                'end': current_time
-            })
-            
-            completed += 1
+        # 调度副本，之后添加的进程不会改变已有结果的进程表
+        table = self.processes.copy()
+        self.is_running = True
+        try:
+            if cpus > 1:
+                self.schedule = schedule_smp(table, algorithm, cpus=cpus,
+                                             balance=self.balance.get(), **params)
+            else:
+                self.schedule = schedule(table, algorithm, **params)
+        except ValueError as e:
+            messagebox.showerror("错误", str(e))
+            return
+        finally:
+            self.is_running = False
         
-        self.visualization.draw_gantt_chart(self.scheduled_processes)
+        self.visualization.show_schedule(self.schedule)
+        self.calculate_metrics()
+        self.update_process_list()
+        if cpus > 1:
+            summary = self.schedule.summary()
+            utilization = ' '.join(f"{u:.0%}" for u in summary['utilization'])
+            self.status_var.set(f"完成 {algorithm} 调度（{cpus}核，迁移 {summary['migrations']} 次，"
+                                f"利用率 {utilization}）")
+        else:
+            self.status_var.set(f"完成 {algorithm} 调度")
     
-    def rr_scheduler(self):
-        """时间片轮转调度"""
+    def compare_all(self):
+        """在后台进程池中并行比较所有调度算法"""
+        if not self.processes:
+            messagebox.showwarning("警告", "没有可调度的进程")
+            return
         try:
-            time_quantum = int(self.time_quantum.get())
+            quanta = [int(q) for q in self.compare_quanta.get().split(',') if q.strip()]
+            if any(q < 1 for q in quanta):
+                raise ValueError
         except ValueError:
-            time_quantum = 2
-        
-        current_time = 0
-        ready_queue = []
-        processes = [Process(p.pid, p.arrival_time, p.burst_time) for p in self.processes]
-        
-        # 按到达时间排序
-        processes.sort(key=lambda p: p.arrival_time)
-        index = 0
-        n = len(processes)
-        
-        while index < n or ready_queue:
-            # 添加到达的进程
-            while index < n and processes[index].arrival_time <= current_time:
-                ready_queue.append(processes[index])
-                index += 1
-            
-            if not ready_queue:
-                current_time += 1
-                continue
-            
-            current_process = ready_queue.pop(0)
-            
-            if current_process.start_time is None:
-                current_process.start_time = current_time
-            
-            # 执行时间片
-            execution_time = min(time_quantum, current_process.remaining_time)
-            start_time = current_time
-            current_time += execution_time
-            current_process.remaining_time -= execution_time
-            
-            # 记录调度过程
-            self.scheduled_processes.append({
-                'pid': current_process.pid,
-                'start': start_time,
-                'end': current_time
-            })
-            
-            # 添加新到达的进程
-            while index < n and processes[index].arrival_time <= current_time:
-                ready_queue.append(processes[index])
-                index += 1
-            
-            # 如果进程未完成，重新加入队列
-            if current_process.remaining_time > 0:
-                ready_queue.append(current_process)
-            else:
-                current_process.finish_time = current_time
-                current_process.waiting_time = current_process.start_time - current_process.arrival_time
-                current_process.turnaround_time = current_process.finish_time - current_process.arrival_time
+            messagebox.showerror("错误", "请输入有效的时间片列表，例如 1,2,4,8")
+            return
         
-        self.visualization.draw_gantt_chart(self.scheduled_processes)
+        # 传入副本：比较进行期间用户仍可以继续添加进程
+        self.status_var.set("正在并行比较所有调度算法...")
+        threading.Thread(target=self.compare_worker, args=(self.processes.copy(), quanta),
+                         daemon=True).start()
     
-    def priority_scheduler(self):
-        """优先级调度（数字越小优先级越高）"""
-        current_time = 0
-        completed = 0
-        n = len(self.processes)
-        processes = [Process(p.pid, p.arrival_time, p.burst_time, p.priority) for p in self.processes]
-        
-        while completed < n:
-            # 找出已到达且优先级最高的进程
-            available = [p for p in processes if p.arrival_time <= current_time and p.remaining_time > 0]
-            
-            if not available:
-                current_time += 1
-                continue
-            
-            # 选择优先级最高的进程（数字越小优先级越高）
-            highest_priority = min(available, key=lambda p: p.priority)
-            
-            if highest_priority.start_time is None:
-                highest_priority.start_time = current_time
-            
-            # 执行进程直到完成
-            execution_time = highest_priority.remaining_time
-            highest_priority.remaining_time = 0
-            current_time += execution_time
-            
-            highest_priority.finish_time = current_time
-            highest_priority.waiting_time = highest_priority.start_time - highest_priority.arrival_time
-            highest_priority.turnaround_time = highest_priority.finish_time - highest_priority.arrival_time
-            
-            # 记录调度过程
-            self.scheduled_processes.append({
-                'pid': highest_priority.pid,
-                'start': highest_priority.start_time,
-                'end': current_time
-            })
-            
-            completed += 1
-        
-        self.visualization.draw_gantt_chart(self.scheduled_processes)
+    def compare_worker(self, table, quanta):
+        """后台线程：运行比较并把结果（或错误）交回主线程显示"""
+        try:
+            rows = compare(table, quanta=quanta or [2])
+        except Exception as e:
+            self.parent.after(0, lambda error=e: self.show_compare_error(error))
+            return
+        self.parent.after(0, lambda: self.show_comparison(rows))
+    
+    def show_compare_error(self, error):
+        messagebox.showerror("错误", f"调度比较失败: {error}")
+        self.status_var.set("调度比较失败")
+    
+    def show_comparison(self, rows):
+        """在新窗口中显示比较结果"""
+        window = tk.Toplevel(self.parent)
+        window.title("调度算法比较")
+        
+        tree = ttk.Treeview(window, columns=COMPARE_COLUMNS, show='headings', height=len(rows))
+        for col in COMPARE_COLUMNS:
+            tree.heading(col, text=COMPARE_HEADINGS[col])
+            tree.column(col, width=120 if col == 'algorithm' else 90)
+        for row in rows:
+            tree.insert('', 'end', values=[
+                f"{row[col]:.2f}" if isinstance(row[col], float) else row[col]
+                for col in COMPARE_COLUMNS
+            ])
+        tree.pack(fill='both', expand=True, padx=5, pady=5)
+        
+        self.status_var.set(f"完成 {len(rows)} 组调度比较")
     
     def calculate_metrics(self):
-        """计算性能指标"""
-        total_waiting = sum(p.waiting_time for p in self.processes)
-        total_turnaround = sum(p.turnaround_time for p in self.processes)
-        n = len(self.processes)
-        
-        avg_waiting = total_waiting / n if n > 0 else 0
-        avg_turnaround = total_turnaround / n if n > 0 else 0
-        
-        self.avg_wait_var.set(f"平均等待时间: {avg_waiting:.2f}")
-        self.avg_turnaround_var.set(f"平均周转时间: {avg_turnaround:.2f}")
+        """显示性能指标（由调度引擎计算）"""
+        summary = self.schedule.summary()
+        self.avg_wait_var.set(f"平均等待时间: {summary['avg_waiting']:.2f}")
+        self.avg_turnaround_var.set(f"平均周转时间: {summary['avg_turnaround']:.2f}")
     
     def reset(self):
         """重置调度器"""
         self.processes.clear()
-        self.scheduled_processes.clear()
+        self.clear_schedule()
+        self.page = 0
         self.next_pid = 1
         self.update_process_list()
-        self.visualization.clear()
-        self.avg_wait_var.set("平均等待时间: --")
-        self.avg_turnaround_var.set("平均周转时间: --")
         self.status_var.set("调度器已重置")
     
     def update_process_list(self):
         """更新进程列表"""
-        for item in self.process_tree.get_children():
-            self.process_tree.delete(item)
-        
-        for process in self.processes:
-            state = "就绪"
-            if hasattr(process, 'finish_time') and process.finish_time:
-                state = "完成"
-            elif hasattr(process, 'start_time') and process.start_time:
-                state = "运行"
-            
-            self.process_tree.insert('', 'end', values=(
-                process.pid,
-                process.arrival_time,
-                process.burst_time,
-                process.priority,
-                state
-            ))
\ No newline at end of file
+        pages = max(1, -(-len(self.processes) // PAGE_SIZE))
+        self.page = min(self.page, pages - 1)
+        self.page_var.set(f"第 {self.page + 1}/{pages} 页（共 {len(self.processes)} 个进程）")
+        
+        # 以进程表行号为 iid（加载的负载中 PID 可能重复），只更新有变化的行
+        state = "完成" if self.schedule else "就绪"
+        start = self.page * PAGE_SIZE
+        rows = range(start, min(len(self.processes), start + PAGE_SIZE))
+        self.tree_sync.update((str(i), (*self.processes.row(i), state)) for i in rows)
+    
+    def change_page(self, step):
+        """翻页"""
+        self.page = max(0, self.page + step)
+        self.update_process_list()
@@ -3,6 +3,7 @@ from tkinter import ttk
 import threading
 import time
 from visualization import SemaphoreVisualization
+from tree_sync import TreeSync
 
 
 class Semaphore:
@@ -39,7 +40,7 @@ class Semaphore:
 
 
 class SemaphoreDemo:
-    def __init__(self, parent, status_var):
+    def __init__(self, parent, status_var, render_loop):
         self.parent = parent
         self.status_var = status_var
         self.semaphore = Semaphore(3)  # 初始值为3
@@ -50,6 +51,9 @@ class SemaphoreDemo:
         self.setup_ui()
         self.visualization = SemaphoreVisualization(self.canvas)
 
+        self.render_loop = render_loop
+        self.render_loop.register(self.parent, self.refresh)
+
     def setup_ui(self):
         """设置信号量界面"""
         # 控制面板
@@ -89,6 +93,7 @@ class SemaphoreDemo:
             self.thread_tree.column(col, width=150)
 
         self.thread_tree.pack(fill='both', expand=True)
+        self.tree_sync = TreeSync(self.thread_tree)
 
         # 可视化画布
         canvas_frame = ttk.LabelFrame(self.parent, text="信号量状态可视化")
@@ -114,12 +119,7 @@ class SemaphoreDemo:
         }
 
         self.threads.append(thread_info)
-        self.update_thread_list()
-        self.visualization.update_semaphore_state(
-            self.semaphore.value,
-            self.semaphore.waiting_queue,
-            [t for t in self.threads if t['state'] == '运行']
-        )
+        self.refresh()
 
         self.status_var.set(f"创建线程: {thread_name}")
 
@@ -144,14 +144,14 @@ class SemaphoreDemo:
     def thread_worker(self, thread_info):
         """线程工作函数"""
         thread_info['state'] = '运行'
-        self.parent.after(0, self.update_thread_list)
+        self.render_loop.mark_dirty(self.parent)
 
         # 尝试获取信号量
         acquired = self.semaphore.P(thread_info['name'], self.semaphore_callback)
 
         if acquired:
             thread_info['state'] = '持有信号量'
-            self.parent.after(0, self.update_thread_list)
+            self.render_loop.mark_dirty(self.parent)
 
             # 模拟临界区操作
             time.sleep(3)
@@ -159,10 +159,10 @@ class SemaphoreDemo:
             # 释放信号量
             self.semaphore.V(self.semaphore_callback)
             thread_info['state'] = '完成'
-            self.parent.after(0, self.update_thread_list)
+            self.render_loop.mark_dirty(self.parent)
         else:
             thread_info['state'] = '阻塞'
-            self.parent.after(0, self.update_thread_list)
+            self.render_loop.mark_dirty(self.parent)
 
     def do_v_operation(self):
         """手动执行V操作"""
@@ -173,15 +173,7 @@ class SemaphoreDemo:
             self.status_var.set("V操作增加信号量值")
 
     def semaphore_callback(self, thread_name, operation, value, waiting_queue):
-        """信号量操作回调"""
-        self.parent.after(0, lambda: self.update_semaphore_display(
-            thread_name, operation, value, waiting_queue
-        ))
-
-    def update_semaphore_display(self, thread_name, operation, value, waiting_queue):
-        """更新信号量显示"""
-        self.sem_status_var.set(f"信号量值: {value}")
-
+        """信号量操作回调：立即更新线程状态，界面由重绘循环刷新"""
         # 更新线程状态
         for thread_info in self.threads:
             if thread_info['name'] == thread_name:
@@ -193,9 +185,15 @@ class SemaphoreDemo:
                     if thread_info['state'] == '持有信号量':
                         thread_info['state'] = '完成'
 
+        self.render_loop.mark_dirty(self.parent)
+
+    def refresh(self):
+        """重绘信号量值、线程列表和状态图"""
+        value = self.semaphore.value
+        self.sem_status_var.set(f"信号量值: {value}")
         self.update_thread_list()
         self.visualization.update_semaphore_state(
-            value, waiting_queue,
+            value, list(self.semaphore.waiting_queue),
             [t for t in self.threads if t['state'] == '持有信号量']
         )
 
@@ -204,8 +202,7 @@ class SemaphoreDemo:
         try:
             value = int(self.sem_value.get())
             self.semaphore = Semaphore(value)
-            self.sem_status_var.set(f"信号量值: {value}")
-            self.visualization.update_semaphore_state(value, [], [])
+            self.refresh()
             self.status_var.set(f"信号量初始值设置为: {value}")
         except ValueError:
             messagebox.showerror("错误", "请输入有效的数字")
@@ -217,13 +214,13 @@ class SemaphoreDemo:
 
     def update_thread_list(self):
         """更新线程列表"""
-        for item in self.thread_tree.get_children():
-            self.thread_tree.delete(item)
-
+        # 以线程名为 iid，只更新有变化的行
+        rows = []
         for thread_info in self.threads:
             operation = "P操作" if thread_info['state'] in ['就绪', '运行'] else "V操作"
-            self.thread_tree.insert('', 'end', values=(
+            rows.append((thread_info['name'], (
                 thread_info['name'],
                 thread_info['state'],
                 operation
-            ))
\ No newline at end of file
+            )))
+        self.tree_sync.update(rows)
\ No newline at end of file
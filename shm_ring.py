@@ -0,0 +1,332 @@
+"""共享内存环形缓冲区（跨进程 IPC）
+
+记录保存在 multiprocessing.shared_memory 中，生产者和消费者是独立的 OS 进程。
+共享内存布局：
+- 前 64 字节为头部，按 8 字节无符号整数访问：读位置、写位置、记录数、
+  累计写入/读出的记录数和字节数、关闭标志；
+- 之后是 capacity 字节的数据区，每条记录为 4 字节长度 + 负载，按 8 字节对齐。
+  数据区末尾放不下一条记录时写入回绕标记，从数据区开头继续。
+
+读写位置是单调递增的字节计数，取模得到偏移。负载通过 memoryview 直接写入和
+读出共享内存，不经过 pickle，也没有中间副本。同步沿用 RingBuffer 的方式：
+一把跨进程锁和两个 Condition（非空/非满），close() 唤醒所有进程中的等待者。
+
+ShmIPC 负责启动生产者/消费者进程，并由后台线程按固定频率采样头部计数，
+界面只读取采样得到的快照。
+"""
+import atexit
+import multiprocessing
+import os
+import random
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from ring_buffer import BufferClosed
+
+HEADER_SIZE = 64
+HEAD, TAIL, COUNT, PUT_COUNT, GET_COUNT, PUT_BYTES, GET_BYTES, CLOSED = range(8)
+WRAP = 0xFFFFFFFF                  # 回绕标记，写在长度字段的位置
+RECORD = struct.Struct('<I')       # 记录长度
+TAG = struct.Struct('<II')         # 演示负载的前 8 字节：生产者编号、序号
+SAMPLE_RATE = 10
+
+
+def record_size(length):
+    """长度为 length 的负载占用的字节数（含长度字段，8 字节对齐）"""
+    return (RECORD.size + length + 7) & ~7
+
+
+class ShmRing:
+    def __init__(self, capacity, ctx=None):
+        capacity = (capacity + 7) & ~7
+        if capacity < 16:
+            raise ValueError("共享内存缓冲区至少需要 16 字节")
+        ctx = ctx or multiprocessing.get_context()
+        self.shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + capacity)
+        self.owner = os.getpid()   # fork 出的子进程也会继承这个对象，只有创建者删除
+        self.lock = ctx.Lock()
+        self.not_empty = ctx.Condition(self.lock)
+        self.not_full = ctx.Condition(self.lock)
+        self._attach(capacity)
+
+    def _attach(self, capacity):
+        self.capacity = capacity
+        self.max_payload = capacity - RECORD.size
+        self.header = self.shm.buf[:HEADER_SIZE].cast('Q')
+        self.data = self.shm.buf[HEADER_SIZE:HEADER_SIZE + capacity]
+
+    def __getstate__(self):
+        # 只传共享内存的名字和同步原语，子进程按名字重新映射
+        return self.shm.name, self.capacity, self.lock, self.not_empty, self.not_full
+
+    def __setstate__(self, state):
+        name, capacity, self.lock, self.not_empty, self.not_full = state
+        self.shm = shared_memory.SharedMemory(name=name)
+        self.owner = None
+        self._attach(capacity)
+
+    def __len__(self):
+        return self.header[COUNT]
+
+    @property
+    def closed(self):
+        return bool(self.header[CLOSED])
+
+    def _fits(self, size):
+        header = self.header
+        if not header[COUNT]:
+            # 缓冲区为空时把读写位置移到下一个整圈的开头，任何不超过容量的记录都放得下
+            header[HEAD] = header[TAIL] = -(-header[TAIL] // self.capacity) * self.capacity
+        tail = header[TAIL]
+        room = self.capacity - tail % self.capacity
+        need = size if room >= size else room + size
+        return tail - header[HEAD] + need <= self.capacity
+
+    def put(self, payload, timeout=None):
+        """写入一条记录（任意 bytes-like）；空间不足时最多等待 timeout 秒，超时返回 False"""
+        payload = memoryview(payload).cast('B')
+        length = len(payload)
+        size = record_size(length)
+        if size > self.capacity:
+            raise ValueError(f"记录过大: {length} 字节，最多 {self.max_payload} 字节")
+        header, data = self.header, self.data
+        with self.not_full:
+            if not self.not_full.wait_for(lambda: header[CLOSED] or self._fits(size), timeout):
+                return False
+            if header[CLOSED]:
+                raise BufferClosed()
+            tail = header[TAIL]
+            pos = tail % self.capacity
+            if self.capacity - pos < size:
+                RECORD.pack_into(data, pos, WRAP)
+                tail += self.capacity - pos
+                pos = 0
+            RECORD.pack_into(data, pos, length)
+            data[pos + RECORD.size:pos + RECORD.size + length] = payload
+            header[TAIL] = tail + size
+            header[COUNT] += 1
+            header[PUT_COUNT] += 1
+            header[PUT_BYTES] += length
+            self.not_empty.notify()
+            return True
+
+    def get_into(self, out, timeout=None):
+        """把最早的一条记录读入可写缓冲区 out，返回字节数；超时返回 None"""
+        header, data = self.header, self.data
+        with self.not_empty:
+            if not self.not_empty.wait_for(lambda: header[COUNT] or header[CLOSED], timeout):
+                return None
+            if not header[COUNT]:
+                raise BufferClosed()
+            head = header[HEAD]
+            pos = head % self.capacity
+            length = RECORD.unpack_from(data, pos)[0]
+            if length == WRAP:
+                head += self.capacity - pos
+                pos = 0
+                length = RECORD.unpack_from(data, pos)[0]
+            out[:length] = data[pos + RECORD.size:pos + RECORD.size + length]
+            header[HEAD] = head + record_size(length)
+            header[COUNT] -= 1
+            header[GET_COUNT] += 1
+            header[GET_BYTES] += length
+            # 记录长度不一，释放的空间可能够任意一个等待的生产者使用
+            self.not_full.notify_all()
+            return length
+
+    def get(self, timeout=None):
+        """取出最早的一条记录并返回 bytes；超时返回 None"""
+        out = bytearray(self.max_payload)
+        length = self.get_into(out, timeout)
+        return None if length is None else bytes(out[:length])
+
+    def snapshot(self, limit=64, peek=32):
+        """按先后顺序返回最多 limit 条记录的 (长度, 前 peek 字节)"""
+        records = []
+        header, data = self.header, self.data
+        with self.lock:
+            head, count = header[HEAD], header[COUNT]
+            for _ in range(min(count, limit)):
+                pos = head % self.capacity
+                length = RECORD.unpack_from(data, pos)[0]
+                if length == WRAP:
+                    head += self.capacity - pos
+                    pos = 0
+                    length = RECORD.unpack_from(data, pos)[0]
+                start = pos + RECORD.size
+                records.append((length, bytes(data[start:start + min(length, peek)])))
+                head += record_size(length)
+        return records
+
+    def stats(self):
+        """不加锁读取头部计数（各字段单独对齐，读到的是某一时刻的值）"""
+        header = self.header
+        return {
+            'count': header[COUNT],
+            'used': header[TAIL] - header[HEAD],
+            'capacity': self.capacity,
+            'put_count': header[PUT_COUNT],
+            'get_count': header[GET_COUNT],
+            'put_bytes': header[PUT_BYTES],
+            'get_bytes': header[GET_BYTES],
+        }
+
+    def close(self):
+        """关闭缓冲区并唤醒所有进程中等待的读写者"""
+        with self.lock:
+            self.header[CLOSED] = 1
+            self.not_empty.notify_all()
+            self.not_full.notify_all()
+
+    def reopen(self):
+        """重新允许读写，保留已有内容"""
+        with self.lock:
+            self.header[CLOSED] = 0
+
+    def release(self):
+        """解除映射；创建者同时删除共享内存"""
+        if self.shm is None:
+            return
+        self.header.release()
+        self.data.release()
+        self.shm.close()
+        if self.owner == os.getpid():
+            self.shm.unlink()
+        self.shm = None
+
+
+def record_label(length, prefix):
+    """快照中一条记录的简短标签"""
+    if len(prefix) < TAG.size:
+        return f"{length}B"
+    producer, seq = TAG.unpack_from(prefix)
+    if producer == 0:  # 手动发送，标签之后是消息文本
+        return prefix[TAG.size:].decode(errors='replace')
+    return f"P{producer}#{seq}"
+
+
+def produce(ring, producer, sizes, interval, stop):
+    """生产者进程：在本地缓冲区填好记录，经 memoryview 切片写入共享内存"""
+    low, high = sizes
+    payload = bytearray(high)
+    view = memoryview(payload)
+    seq = 0
+    while not stop.is_set():
+        TAG.pack_into(payload, 0, producer, seq)
+        try:
+            ring.put(view[:random.randint(low, high)])
+        except BufferClosed:
+            break
+        seq += 1
+        if interval and stop.wait(interval):
+            break
+    ring.release()
+
+
+def consume(ring, interval, stop):
+    """消费者进程：把记录读入复用的本地缓冲区"""
+    out = bytearray(ring.max_payload)
+    while not stop.is_set():
+        try:
+            ring.get_into(out)
+        except BufferClosed:
+            break
+        if interval and stop.wait(interval):
+            break
+    ring.release()
+
+
+class ShmIPC:
+    """管理共享内存环形缓冲区和生产者/消费者进程，后台线程采样状态"""
+
+    def __init__(self, capacity, on_sample=None, rate=SAMPLE_RATE):
+        self.ctx = multiprocessing.get_context()
+        self.ring = ShmRing(capacity, self.ctx)
+        self.on_sample = on_sample
+        self.rate = rate
+        self.stop_event = self.ctx.Event()
+        self.workers = []
+        self.next_producer = 1
+        self.manual_seq = 0
+        # 最近一次采样：(头部计数, 缓冲区记录快照, 采样时刻)
+        self.sample = (self.ring.stats(), [], time.monotonic())
+        self.stopped = threading.Event()
+        self.thread = None
+        atexit.register(self.release)
+
+    @property
+    def capacity(self):
+        return self.ring.capacity
+
+    def alive(self):
+        return any(w.is_alive() for w in self.workers)
+
+    def _spawn(self, target, args):
+        self.stop_event.clear()
+        worker = self.ctx.Process(target=target, args=(self.ring, *args, self.stop_event), daemon=True)
+        worker.start()
+        self.workers.append(worker)
+        if self.thread is None:
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def start_producers(self, count, interval, sizes):
+        """启动 count 个生产者进程，负载长度在 sizes=(最小, 最大) 字节间均匀分布"""
+        low, high = sizes
+        if not TAG.size <= low <= high or record_size(high) > self.capacity:
+            raise ValueError(f"记录大小须在 {TAG.size}–{self.ring.max_payload} 字节之间")
+        for _ in range(count):
+            self._spawn(produce, (self.next_producer, sizes, interval))
+            self.next_producer += 1
+
+    def start_consumers(self, count, interval):
+        """启动 count 个消费者进程"""
+        for _ in range(count):
+            self._spawn(consume, (interval,))
+
+    def send(self, message):
+        """在当前进程写入一条手动消息（空间不足时不等待）"""
+        self.manual_seq += 1
+        payload = TAG.pack(0, self.manual_seq) + message.encode()
+        return self.ring.put(payload, timeout=0)
+
+    def run(self):
+        while True:
+            self.sample_now()
+            if self.on_sample is not None:
+                self.on_sample()
+            if self.stopped.wait(1 / self.rate):
+                return
+
+    def sample_now(self):
+        """采样一次头部计数和缓冲区内容"""
+        records = [(length, record_label(length, prefix)) for length, prefix in self.ring.snapshot()]
+        self.sample = (self.ring.stats(), records, time.monotonic())
+        return self.sample
+
+    def stop(self):
+        """停止所有进程：关闭缓冲区唤醒阻塞者并等待退出，然后停止采样"""
+        self.stop_event.set()
+        self.ring.close()
+        for worker in self.workers:
+            worker.join(1)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self.workers = []
+        self.ring.reopen()
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.sample_now()
+
+    def release(self):
+        """停止并删除共享内存"""
+        if self.ring.shm is None:
+            return
+        self.stop()
+        self.ring.release()
+        atexit.unregister(self.release)
@@ -0,0 +1,87 @@
+"""模拟时钟
+
+把模拟时间和墙上时间解耦：时钟线程调用 wait_tick() 等待下一个节拍，
+节拍间隔为 tick / speed 秒；speed 为 None 时不等待（尽可能快）。
+暂停、继续、单步和停止都通过 Condition 唤醒等待中的线程，不需要轮询标志。
+"""
+import threading
+import time
+
+# 界面上可选的速度倍率，None 表示尽可能快
+SPEEDS = {'1x': 1, '10x': 10, '100x': 100, '1000x': 1000, '最快': None}
+
+
+class SimClock:
+    def __init__(self, tick=0.1, speed=1):
+        self.tick = tick       # 每个节拍代表的模拟秒数
+        self.speed = speed
+        self.now = 0.0         # 当前模拟时间
+        self.ticks = 0
+        self.paused = True
+        self.stopped = False
+        self.pending_steps = 0
+        self.cond = threading.Condition()
+        self._next = time.monotonic()
+    
+    def wait_tick(self):
+        """阻塞到下一个节拍；时钟停止时返回 False"""
+        with self.cond:
+            while True:
+                if self.stopped:
+                    return False
+                if self.pending_steps:
+                    self.pending_steps -= 1
+                    break
+                if self.paused:
+                    self.cond.wait()
+                    continue
+                if self.speed is None:
+                    break
+                now = time.monotonic()
+                if now >= self._next:
+                    # 落后超过一秒时不再追赶，避免恢复后连续突发
+                    self._next = max(self._next + self.tick / self.speed, now - 1)
+                    break
+                self.cond.wait(self._next - now)
+            self.ticks += 1
+            self.now = self.ticks * self.tick
+            return True
+    
+    def resume(self):
+        with self.cond:
+            self.paused = False
+            self._next = time.monotonic() + (self.tick / self.speed if self.speed else 0)
+            self.cond.notify_all()
+    
+    def pause(self):
+        with self.cond:
+            self.paused = True
+            self.cond.notify_all()
+    
+    def step(self, ticks=1):
+        """暂停状态下前进指定节拍数"""
+        with self.cond:
+            self.pending_steps += ticks
+            self.cond.notify_all()
+    
+    def set_speed(self, speed):
+        """修改倍率，立即按新的间隔计算下一个节拍"""
+        with self.cond:
+            self.speed = speed
+            self._next = time.monotonic() + (self.tick / speed if speed else 0)
+            self.cond.notify_all()
+    
+    def stop(self):
+        """唤醒并结束所有等待的线程"""
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+    
+    def reset(self):
+        """回到 0 时刻并进入暂停状态（应在等待线程结束后调用）"""
+        with self.cond:
+            self.now = 0.0
+            self.ticks = 0
+            self.paused = True
+            self.stopped = False
+            self.pending_steps = 0
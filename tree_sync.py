@@ -0,0 +1,45 @@
+"""Treeview 增量更新
+
+每一行用稳定的 iid（如 PID、线程名）标识。update 只对值发生变化的行调用
+item(iid, values=...)，只在行集合变化时插入或删除行、顺序变化时移动行，而不是每次刷新都
+清空后全部重建。
+"""
+
+
+class TreeSync:
+    def __init__(self, tree):
+        self.tree = tree
+        self.values = {}  # iid -> 当前显示的值
+        self.order = []   # 当前显示顺序
+    
+    def update(self, rows):
+        """rows 为 (iid, values) 序列，按显示顺序排列"""
+        rows = [(iid, tuple(values)) for iid, values in rows]
+        seen = {iid for iid, _ in rows}
+        removed = [iid for iid in self.values if iid not in seen]
+        if removed:
+            self.tree.delete(*removed)
+            for iid in removed:
+                del self.values[iid]
+        
+        # order 与 Treeview 中的实际顺序保持一致，只移动位置不对的行
+        order = [iid for iid in self.order if iid in seen]
+        for index, (iid, values) in enumerate(rows):
+            old = self.values.get(iid)
+            if old is None:
+                self.tree.insert('', index, iid=iid, values=values)
+                order.insert(index, iid)
+            else:
+                if order[index] != iid:
+                    self.tree.move(iid, '', index)
+                    order.remove(iid)
+                    order.insert(index, iid)
+                if old == values:
+                    continue
+                self.tree.item(iid, values=values)
+            self.values[iid] = values
+        self.order = order
+    
+    def clear(self):
+        """删除所有行"""
+        self.update(())
@@ -1,45 +1,90 @@
 import tkinter as tk
 import random
+from gantt_layout import GanttIndex, GanttLayout, MARGIN_X
 
 class ProcessVisualization:
+    """进程状态图（保留模式）
+
+    每个 PID 的矩形、标签和进度条只创建一次，之后用 coords/itemconfig 更新；
+    只有进程集合变化时才创建或删除画布项。
+    """
+    COLUMNS = 7
+    
     def __init__(self, canvas):
         self.canvas = canvas
+        # pid -> {'rect', 'label', 'bar', 'fill', 'pos', 'state', 'progress'}
         self.process_rects = {}
+        self.legend_drawn = False
+        self.empty_text = None
     
     def update_processes(self, processes):
         """更新进程可视化"""
-        self.canvas.delete("all")
-        self.process_rects.clear()
-        
         if not processes:
-            self.canvas.create_text(300, 150, text="暂无进程", font=("Arial", 16))
+            for pid in list(self.process_rects):
+                self.remove_process(pid)
+            if self.legend_drawn:
+                self.canvas.delete('legend')
+                self.legend_drawn = False
+            if self.empty_text is None:
+                self.empty_text = self.canvas.create_text(300, 150, text="暂无进程", font=("Arial", 16))
             return
         
+        if self.empty_text is not None:
+            self.canvas.delete(self.empty_text)
+            self.empty_text = None
+        
         # 绘制状态图例
-        self.draw_legend()
+        if not self.legend_drawn:
+            self.draw_legend()
+            self.legend_drawn = True
+        
+        # 删除已不存在的进程
+        current = {process['pid'] for process in processes}
+        for pid in [pid for pid in self.process_rects if pid not in current]:
+            self.remove_process(pid)
         
-        # 绘制进程状态
-        x, y = 50, 100
+        # 更新或创建进程状态
         for i, process in enumerate(processes):
-            color = self.get_state_color(process['state'])
-            
-            # 绘制进程矩形
-            rect = self.canvas.create_rectangle(x, y, x+80, y+40, fill=color, outline='black')
-            self.canvas.create_text(x+40, y+20, text=f"PID: {process['pid']}", font=("Arial", 10))
+            x = 50 + (i % self.COLUMNS) * 100
+            y = 100 + (i // self.COLUMNS) * 80
+            items = self.process_rects.get(process['pid'])
+            if items is None:
+                self.create_process(process, x, y)
+                continue
             
-            # 绘制进度条
-            progress_x = x
-            progress_y = y + 45
-            self.canvas.create_rectangle(progress_x, progress_y, progress_x+80, progress_y+10, outline='gray')
-            fill_width = 80 * process['progress'] / 100
-            self.canvas.create_rectangle(progress_x, progress_y, progress_x+fill_width, progress_y+10, fill='blue')
-            
-            self.process_rects[process['pid']] = rect
-            
-            x += 100
-            if x > 700:
-                x = 50
-                y += 80
+            if items['pos'] != (x, y):
+                self.canvas.coords(items['rect'], x, y, x+80, y+40)
+                self.canvas.coords(items['label'], x+40, y+20)
+                self.canvas.coords(items['bar'], x, y+45, x+80, y+55)
+                items['pos'] = (x, y)
+                items['progress'] = None
+            if items['state'] != process['state']:
+                self.canvas.itemconfig(items['rect'], fill=self.get_state_color(process['state']))
+                items['state'] = process['state']
+            if items['progress'] != process['progress']:
+                fill_width = 80 * process['progress'] / 100
+                self.canvas.coords(items['fill'], x, y+45, x+fill_width, y+55)
+                items['progress'] = process['progress']
+    
+    def create_process(self, process, x, y):
+        """为新进程创建画布项"""
+        color = self.get_state_color(process['state'])
+        fill_width = 80 * process['progress'] / 100
+        self.process_rects[process['pid']] = {
+            'rect': self.canvas.create_rectangle(x, y, x+80, y+40, fill=color, outline='black'),
+            'label': self.canvas.create_text(x+40, y+20, text=f"PID: {process['pid']}", font=("Arial", 10)),
+            'bar': self.canvas.create_rectangle(x, y+45, x+80, y+55, outline='gray'),
+            'fill': self.canvas.create_rectangle(x, y+45, x+fill_width, y+55, fill='blue'),
+            'pos': (x, y),
+            'state': process['state'],
+            'progress': process['progress'],
+        }
+    
+    def remove_process(self, pid):
+        """删除进程对应的画布项"""
+        items = self.process_rects.pop(pid)
+        for key in ('rect', 'label', 'bar', 'fill'):
+            self.canvas.delete(items[key])
     
     def get_state_color(self, state):
         """根据状态返回颜色"""
@@ -58,8 +103,8 @@ class ProcessVisualization:
         
         x, y = 50, 30
         for state, color in zip(states, colors):
-            self.canvas.create_rectangle(x, y, x+20, y+20, fill=color, outline='black')
-            self.canvas.create_text(x+40, y+10, text=state, anchor='w', font=("Arial", 10))
+            self.canvas.create_rectangle(x, y, x+20, y+20, fill=color, outline='black', tags='legend')
+            self.canvas.create_text(x+40, y+10, text=state, anchor='w', font=("Arial", 10), tags='legend')
             x += 100
 
 class IPCVisualization:
@@ -82,12 +127,14 @@ class IPCVisualization:
         self.canvas.create_rectangle(buffer_x, buffer_y, buffer_x+200, buffer_y+60, fill='white', outline='black')
         self.canvas.create_text(buffer_x+100, buffer_y-10, text="共享缓冲区", font=("Arial", 10))
         
-        # 绘制缓冲区内容
+        # 绘制缓冲区内容（超过 5 条时缩小格子，太窄时不显示文字）
+        slot = 40 if len(buffer) <= 5 else 190 / len(buffer)
         for i, item in enumerate(buffer):
-            self.canvas.create_rectangle(buffer_x+10+i*40, buffer_y+10, 
-                                       buffer_x+40+i*40, buffer_y+40, 
+            x = buffer_x + 10 + i * slot
+            self.canvas.create_rectangle(x, buffer_y+10, x+slot*0.75, buffer_y+40, 
                                        fill='yellow', outline='black')
-            self.canvas.create_text(buffer_x+25+i*40, buffer_y+25, text=item[:3], font=("Arial", 8))
+            if slot >= 20:
+                self.canvas.create_text(x+slot*0.375, buffer_y+25, text=item[:3], font=("Arial", 8))
         
         # 绘制箭头
         if role == "producer":
@@ -95,9 +142,21 @@ class IPCVisualization:
         elif role == "consumer":
             self.draw_arrow(500, 150, 600, 150, "blue", message)
     
-    def draw_arrow(self, x1, y1, x2, y2, color, message):
+    def update_flow(self, produced, consumed, buffer):
+        """批量/采样模式：同时画出两个方向的汇总箭头，标注一帧内传输的条数"""
+        self.update_communication(None, "", buffer)
+        if produced:
+            self.draw_arrow(200, 150, 300, 150, "red", f"{produced} 条", self.flow_width(produced))
+        if consumed:
+            self.draw_arrow(500, 150, 600, 150, "blue", f"{consumed} 条", self.flow_width(consumed))
+    
+    def flow_width(self, count):
+        """箭头粗细随条数按对数增长"""
+        return min(8, 2 + count.bit_length() // 2)
+    
+    def draw_arrow(self, x1, y1, x2, y2, color, message, width=2):
         """绘制箭头和消息"""
-        self.canvas.create_line(x1, y1, x2, y2, arrow=tk.LAST, fill=color, width=2)
+        self.canvas.create_line(x1, y1, x2, y2, arrow=tk.LAST, fill=color, width=width)
         self.canvas.create_text((x1+x2)/2, y1-20, text=message, fill=color, font=("Arial", 10))
 
 class SemaphoreVisualization:
@@ -131,61 +190,127 @@ class SemaphoreVisualization:
                 queue_y += 50
 
 class SchedulerVisualization:
-    def __init__(self, canvas):
+    """可缩放、可平移的甘特图
+
+    片段保存在 GanttIndex 中，每次重绘只查询当前时间窗口内的片段，亚像素
+    片段合并为聚合条，所以画布项数量只取决于画布宽度。滚轮以鼠标位置为
+    中心缩放，左键拖动平移，双击恢复全图。
+    """
+    MIN_SPAN = 1
+
+    def __init__(self, canvas, xscrollbar=None):
         self.canvas = canvas
-    
+        self.xscrollbar = xscrollbar
+        self.index = None
+        self.view = (0, 1)
+        self._drag_x = None
+
+        canvas.bind('<MouseWheel>', lambda e: self.zoom(e.x, 0.8 if e.delta > 0 else 1.25))
+        canvas.bind('<Button-4>', lambda e: self.zoom(e.x, 0.8))
+        canvas.bind('<Button-5>', lambda e: self.zoom(e.x, 1.25))
+        canvas.bind('<ButtonPress-1>', self._start_drag)
+        canvas.bind('<B1-Motion>', self._drag)
+        canvas.bind('<Double-Button-1>', lambda e: self.reset_view())
+        canvas.bind('<Configure>', lambda e: self.redraw())
+        if xscrollbar is not None:
+            xscrollbar.configure(command=self.xview)
+
     def draw_gantt_chart(self, scheduled_processes):
-        """绘制甘特图"""
+        """绘制甘特图（片段字典列表）"""
+        self.show_index(GanttIndex.from_segments(scheduled_processes) if scheduled_processes else None)
+
+    def show_schedule(self, schedule):
+        """绘制 Schedule / SMPSchedule 的执行片段"""
+        self.show_index(GanttIndex.from_schedule(schedule) if len(schedule.seg_pid) else None)
+
+    def show_index(self, index):
+        self.index = index
+        self.reset_view()
+
+    def reset_view(self):
+        """显示全部时间范围"""
+        if self.index is not None:
+            self.view = (0, max(self.MIN_SPAN, self.index.max_time))
+        self.redraw()
+
+    def _chart_width(self):
+        width = self.canvas.winfo_width()
+        return width - 2 * MARGIN_X if width > 2 * MARGIN_X + 100 else 700
+
+    def _time_at(self, x):
+        t0, t1 = self.view
+        return t0 + (x - MARGIN_X) * (t1 - t0) / self._chart_width()
+
+    def _clamp(self, t0, t1):
+        """把窗口限制在 [0, max_time] 内"""
+        limit = max(self.MIN_SPAN, self.index.max_time)
+        span = min(max(t1 - t0, self.MIN_SPAN), limit)
+        t0 = min(max(t0, 0), limit - span)
+        return t0, t0 + span
+
+    def zoom(self, x, factor):
+        """以画布 x 处的时间点为中心缩放"""
+        if self.index is None:
+            return
+        t0, t1 = self.view
+        center = min(max(self._time_at(x), t0), t1)
+        self.view = self._clamp(center - (center - t0) * factor, center + (t1 - center) * factor)
+        self.redraw()
+
+    def _start_drag(self, event):
+        self._drag_x = event.x
+
+    def _drag(self, event):
+        if self.index is None or self._drag_x is None:
+            return
+        t0, t1 = self.view
+        shift = (self._drag_x - event.x) * (t1 - t0) / self._chart_width()
+        self._drag_x = event.x
+        self.view = self._clamp(t0 + shift, t1 + shift)
+        self.redraw()
+
+    def xview(self, *args):
+        """水平滚动条回调：('moveto', f) 或 ('scroll', n, 'units'|'pages')"""
+        if self.index is None:
+            return
+        t0, t1 = self.view
+        span = t1 - t0
+        if args[0] == 'moveto':
+            t0 = float(args[1]) * max(self.MIN_SPAN, self.index.max_time)
+        elif args[0] == 'scroll':
+            t0 += int(args[1]) * (span if args[2] == 'pages' else span / 10)
+        self.view = self._clamp(t0, t0 + span)
+        self.redraw()
+
+    def redraw(self):
+        """只绘制当前窗口内的图元"""
         self.canvas.delete("all")
-        
-        if not scheduled_processes:
+
+        if self.index is None:
             self.canvas.create_text(300, 100, text="暂无调度数据", font=("Arial", 16))
+            if self.xscrollbar is not None:
+                self.xscrollbar.set(0, 1)
             return
-        
-        # 计算时间范围
-        max_time = max(p['end'] for p in scheduled_processes)
-        
-        # 设置坐标参数
-        margin_x = 50
-        margin_y = 50
-        chart_width = 700
-        chart_height = 100
-        time_scale = chart_width / max(1, max_time)
-        
-        # 绘制时间轴
-        for time in range(0, max_time + 1, max(1, max_time // 10)):
-            x = margin_x + time * time_scale
-            self.canvas.create_line(x, margin_y + chart_height, x, margin_y + chart_height + 10)
-            self.canvas.create_text(x, margin_y + chart_height + 15, text=str(time), font=("Arial", 8))
-        
-        # 绘制进程条
-        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8', '#F7DC6F']
-        
-        y_positions = {}
-        current_y = margin_y
-        
-        for i, process in enumerate(scheduled_processes):
-            pid = process['pid']
-            if pid not in y_positions:
-                y_positions[pid] = current_y
-                current_y += 25
-            
-            y = y_positions[pid]
-            x1 = margin_x + process['start'] * time_scale
-            x2 = margin_x + process['end'] * time_scale
-            
-            color = colors[pid % len(colors)]
-            self.canvas.create_rectangle(x1, y, x2, y+20, fill=color, outline='black')
-            self.canvas.create_text((x1+x2)/2, y+10, text=f"P{pid}", font=("Arial", 8))
-        
-        # 绘制图例
-        legend_x, legend_y = margin_x, margin_y + chart_height + 40
-        for pid, y in y_positions.items():
-            color = colors[pid % len(colors)]
-            self.canvas.create_rectangle(legend_x, legend_y, legend_x+20, legend_y+15, fill=color, outline='black')
-            self.canvas.create_text(legend_x+25, legend_y+7, text=f"P{pid}", anchor='w', font=("Arial", 8))
-            legend_x += 60
-    
+
+        if self.xscrollbar is not None:
+            limit = max(self.MIN_SPAN, self.index.max_time)
+            self.xscrollbar.set(self.view[0] / limit, self.view[1] / limit)
+
+        layout = GanttLayout(self.index, self._chart_width())
+        for item in layout.primitives(*self.view):
+            kind = item[0]
+            if kind == 'rect':
+                _, x1, y1, x2, y2, fill, outline = item
+                self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill, outline=outline)
+            elif kind == 'line':
+                self.canvas.create_line(*item[1:])
+            else:
+                _, x, y, text, anchor, size = item
+                self.canvas.create_text(x, y, text=text, anchor=anchor, font=("Arial", size))
+
     def clear(self):
         """清空画布"""
-        self.canvas.delete("all")
\ No newline at end of file
+        self.index = None
+        self.canvas.delete("all")
+        if self.xscrollbar is not None:
+            self.xscrollbar.set(0, 1)
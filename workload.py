@@ -0,0 +1,230 @@
+"""调度负载的读写与生成
+
+文件格式：
+    CSV    表头为 pid,arrival,burst,priority，每行一个进程
+    二进制  16 字节文件头（魔数 b'OSWL'、版本、行数）后接定长记录，
+           每条记录为 4 个小端 int32：pid, arrival, burst, priority
+
+二进制文件通过 mmap 读取，按列直接拷贝进 ProcessTable 的 array，
+不会为每一行创建对象；iter_binary 可以分块流式处理超大文件。
+
+命令行生成可复现的负载::
+
+    python workload.py trace.bin -n 2000000 --burst pareto --arrival bursty --seed 42
+"""
+import argparse
+import csv
+import mmap
+import random
+import struct
+import sys
+from array import array
+from sched_engine import ProcessTable
+
+MAGIC = b'OSWL'
+VERSION = 1
+HEADER = struct.Struct('<4sIQ')
+RECORD = struct.Struct('<iiii')
+FIELDS = ('pid', 'arrival', 'burst', 'priority')
+
+ARRIVAL_PATTERNS = ('uniform', 'poisson', 'bursty')
+BURST_DISTRIBUTIONS = ('uniform', 'exponential', 'pareto')
+INT32_MAX = 2 ** 31 - 1   # 进程表和二进制格式中各字段均为 32 位有符号整数
+
+
+def load_csv(path):
+    """读取 CSV 负载文件"""
+    table = ProcessTable()
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return table
+        columns = [header.index(name) for name in FIELDS[:3]]
+        priority_column = header.index('priority') if 'priority' in header else None
+        for row in reader:
+            if not row:
+                continue
+            try:
+                priority = int(row[priority_column]) if priority_column is not None else 1
+                table.append(int(row[columns[0]]), int(row[columns[1]]), int(row[columns[2]]), priority)
+            except (IndexError, OverflowError):
+                raise ValueError(f"负载文件第 {reader.line_num} 行缺少列或数值越界: {path}")
+    return table
+
+
+def save_csv(table, path):
+    """写出 CSV 负载文件"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(table.rows())
+
+
+def save_binary(table, path):
+    """写出二进制负载文件"""
+    records = array('i', bytes(RECORD.size * len(table)))
+    for column, name in enumerate(FIELDS):
+        records[column::4] = getattr(table, name)
+    if sys.byteorder == 'big':
+        records.byteswap()
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(table)))
+        records.tofile(f)
+
+
+def _read_header(mm, path):
+    if len(mm) < HEADER.size:
+        raise ValueError(f"不是有效的负载文件: {path}")
+    magic, version, count = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"不是有效的负载文件: {path}")
+    if HEADER.size + count * RECORD.size > len(mm):
+        raise ValueError(f"负载文件不完整: {path}")
+    return count
+
+
+def _columns_into(table, view):
+    """把一段 int32 记录视图按列追加到 table"""
+    for column, name in enumerate(FIELDS):
+        values = array('i', view[column::4].tobytes())
+        if sys.byteorder == 'big':
+            values.byteswap()
+        getattr(table, name).extend(values)
+
+
+def iter_binary(path, chunk_rows=1 << 20):
+    """分块读取二进制负载文件，每块是一个 ProcessTable"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        count = _read_header(mm, path)
+        records = memoryview(mm)[HEADER.size:HEADER.size + count * RECORD.size].cast('i')
+        try:
+            for start in range(0, count, chunk_rows):
+                chunk = ProcessTable()
+                _columns_into(chunk, records[start * 4:(start + chunk_rows) * 4])
+                yield chunk
+        finally:
+            records.release()
+
+
+def load_binary(path):
+    """通过 mmap 读取整个二进制负载文件"""
+    table = ProcessTable()
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            raise ValueError(f"不是有效的负载文件: {path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            count = _read_header(mm, path)
+            records = memoryview(mm)[HEADER.size:HEADER.size + count * RECORD.size].cast('i')
+            try:
+                _columns_into(table, records)
+            finally:
+                records.release()
+    return table
+
+
+def load(path):
+    """按扩展名读取负载文件（.csv 为文本，其余为二进制）"""
+    if str(path).lower().endswith('.csv'):
+        return load_csv(path)
+    return load_binary(path)
+
+
+def save(table, path):
+    """按扩展名写出负载文件"""
+    if str(path).lower().endswith('.csv'):
+        save_csv(table, path)
+    else:
+        save_binary(table, path)
+
+
+def generate(n, seed=0, arrival='poisson', burst='exponential', mean_interarrival=10.0,
+             mean_burst=8.0, max_burst=10000, pareto_alpha=1.5, burst_size=50, priorities=5):
+    """生成可复现的随机负载
+
+    arrival:
+        'uniform' 到达时间在 [0, n * mean_interarrival) 内均匀分布
+        'poisson' 到达间隔服从指数分布（泊松到达）
+        'bursty'  成批到达：每批约 burst_size 个进程几乎同时到达，批间隔较长，
+                  平均到达率与 mean_interarrival 一致
+    burst:
+        'uniform'     [1, 2 * mean_burst] 均匀分布
+        'exponential' 均值为 mean_burst 的指数分布
+        'pareto'      形状参数为 pareto_alpha 的重尾分布，均值约为 mean_burst
+    执行时间截断到 [1, max_burst]。
+    """
+    if arrival not in ARRIVAL_PATTERNS:
+        raise ValueError(f"未知的到达模式: {arrival}")
+    if burst not in BURST_DISTRIBUTIONS:
+        raise ValueError(f"未知的执行时间分布: {burst}")
+    if n > INT32_MAX or max_burst > INT32_MAX:
+        raise ValueError(f"进程数和最大执行时间不能超过 {INT32_MAX}")
+    if n * mean_interarrival > INT32_MAX:
+        raise ValueError(f"到达时间跨度约 {n * mean_interarrival:.0f}，超出 32 位整数范围，"
+                         f"请减少进程数或平均到达间隔")
+
+    rng = random.Random(seed)
+    table = ProcessTable()
+    table.pid = array('i', range(1, n + 1))
+
+    try:
+        if arrival == 'uniform':
+            span = n * mean_interarrival
+            table.arrival = array('i', sorted(int(rng.random() * span) for _ in range(n)))
+        elif arrival == 'poisson':
+            rate = 1 / mean_interarrival
+            arrivals = array('i')
+            t = 0.0
+            for _ in range(n):
+                t += rng.expovariate(rate)
+                arrivals.append(int(t))
+            table.arrival = arrivals
+        else:
+            arrivals = array('i')
+            t = 0.0
+            gap = mean_interarrival * burst_size
+            while len(arrivals) < n:
+                t += rng.expovariate(1 / gap)
+                size = min(n - len(arrivals), max(1, int(rng.expovariate(1 / burst_size))))
+                arrivals.extend(int(t + rng.random() * mean_interarrival) for _ in range(size))
+            table.arrival = array('i', sorted(arrivals))
+    except OverflowError:
+        raise ValueError("生成的到达时间超出 32 位整数范围，请减少进程数或平均到达间隔")
+
+    if burst == 'uniform':
+        top = max(1, int(2 * mean_burst))
+        bursts = (rng.randint(1, top) for _ in range(n))
+    elif burst == 'exponential':
+        bursts = (int(rng.expovariate(1 / mean_burst)) + 1 for _ in range(n))
+    else:
+        # Pareto 的最小值 xm 取使均值为 mean_burst 的值
+        xm = mean_burst * (pareto_alpha - 1) / pareto_alpha if pareto_alpha > 1 else 1.0
+        bursts = (int(xm * rng.paretovariate(pareto_alpha)) for _ in range(n))
+    table.burst = array('i', (min(max_burst, max(1, b)) for b in bursts))
+
+    table.priority = array('i', (rng.randint(1, priorities) for _ in range(n)))
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成可复现的调度负载文件")
+    parser.add_argument('output', help="输出文件（.csv 为文本，其余为二进制）")
+    parser.add_argument('-n', type=int, default=10000, help="进程数")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--arrival', choices=ARRIVAL_PATTERNS, default='poisson')
+    parser.add_argument('--burst', choices=BURST_DISTRIBUTIONS, default='exponential')
+    parser.add_argument('--mean-interarrival', type=float, default=10.0)
+    parser.add_argument('--mean-burst', type=float, default=8.0)
+    args = parser.parse_args()
+
+    try:
+        table = generate(args.n, seed=args.seed, arrival=args.arrival, burst=args.burst,
+                         mean_interarrival=args.mean_interarrival, mean_burst=args.mean_burst)
+    except ValueError as e:
+        parser.error(str(e))
+    save(table, args.output)
+    print(f"已生成 {len(table)} 个进程: {args.output}")
+
+
+if __name__ == "__main__":
+    main()